@@ -0,0 +1,403 @@
+# Autor: Yago Assis Mendes Faria
+import asyncio
+import os
+import random
+import string
+
+'''
+ Casos da suíte de benchmarks (benchmarks/suite.py), um grupo por componente
+
+    Cada caso é um gerador que recebe o Ambiente da suíte: monta o cenário,
+    faz yield da operação medida e desfaz o cenário depois do yield. A
+    operação retorna quantos itens processou (qualquer outro valor conta como 1) ou é um par
+    (prepara, executa), em que só executa(prepara()) entra na medição.
+    Os nomes seguem "componente.operação" para o filtro -k da suíte.
+    tolerancia substitui a --tolerancia da suíte no caso (casos limitados pelo disco).
+'''
+
+# (nome, função, iterações, aquecimento, tolerância ou None), na ordem de registro
+CASOS = []
+
+
+def caso(nome, iteracoes=200, aquecimento=5, tolerancia=None):
+    def registra(funcao):
+        CASOS.append((nome, funcao, iteracoes, aquecimento, tolerancia))
+        return funcao
+    return registra
+
+
+def _textos(quantidade, tamanho, semente=42):
+    gerador = random.Random(semente)
+    alfabeto = string.ascii_letters + string.digits + ' áéíóúç'
+    return [''.join(gerador.choices(alfabeto, k=tamanho)) for _ in range(quantidade)]
+
+
+def _criptografia():
+    from modules.criptografia import Criptografia
+
+    cripto = Criptografia()
+    cripto.c_a, cripto.c_b = 131, 43342
+    return cripto
+
+
+# ---------------------------------------------------------------- criptografia
+
+@caso('criptografia.encriptar', iteracoes=2000)
+def _(ambiente):
+    cripto = _criptografia()
+    texto = _textos(1, 256)[0]
+    yield lambda: cripto.encriptar(texto)
+
+
+@caso('criptografia.desencriptar', iteracoes=2000)
+def _(ambiente):
+    cripto = _criptografia()
+    encriptado = cripto.encriptar(_textos(1, 256)[0])
+    yield lambda: cripto.desencriptar(encriptado)
+
+
+@caso('criptografia.encriptar_lote[1000x32]', iteracoes=50)
+def _(ambiente):
+    cripto = _criptografia()
+    textos = _textos(1000, 32)
+    yield lambda: len(cripto.encriptar_lote(textos))
+
+
+@caso('criptografia.desencriptar_lote[1000x32]', iteracoes=50)
+def _(ambiente):
+    cripto = _criptografia()
+    encriptados = cripto.encriptar_lote(_textos(1000, 32))
+    yield lambda: len(cripto.desencriptar_lote(encriptados))
+
+
+@caso('criptografia.encriptar_arquivo[1M caracteres]', iteracoes=5, aquecimento=1)
+def _(ambiente):
+    cripto = _criptografia()
+    origem = os.path.join(ambiente.subpasta('criptografia'), 'origem.txt')
+    destino = origem + '.enc'
+    with open(origem, 'w', encoding='utf-8', newline='') as arquivo:
+        arquivo.write(''.join(_textos(1000, 1000)))
+    yield lambda: cripto.encriptar_arquivo(origem, destino, chunk_size=1 << 18)
+
+
+# ---------------------------------------------------------------------- config
+
+def _config_email(ambiente, porta=25, **extras):
+    return ambiente.config('config_email.json', {
+        'email': {
+            'smtp_server': '127.0.0.1', 'smtp_port': porta, 'user': 'robo', 'password': 'senha',
+            'from': 'robo@exemplo.com', 'alias': 'Robô', 'cc': [], 'email_log': 'log@exemplo.com',
+            'destinatario': 'destino@exemplo.com', **extras,
+        },
+        'nome_robo': 'Benchmark',
+        'process_success': {'subject': 'Relatório de {data}', 'body': '<p>{NomeRobo} ok em {data}.</p><p>{mensagem}</p>'},
+        'process_error': {'subject': 'Erro em {data}', 'body': '<p>{NomeRobo} falhou em {data}.</p><p>{mensagem}</p>'},
+    })
+
+
+@caso('config.get_data[caminho pontuado]', iteracoes=20000, aquecimento=100)
+def _(ambiente):
+    from modules.config import ConfigHandler
+
+    config = ConfigHandler(_config_email(ambiente))
+    yield lambda: config.get_data('email.smtp_port', 25, tipo=int)
+
+
+@caso('config.instancia[registro do processo]', iteracoes=2000)
+def _(ambiente):
+    from modules.config import ConfigHandler
+
+    caminho = _config_email(ambiente)
+    ConfigHandler(caminho)
+    yield lambda: ConfigHandler(caminho)
+
+
+@caso('config.set_e_save_config', iteracoes=200)
+def _(ambiente):
+    from modules.config import ConfigHandler
+
+    config = ConfigHandler(_config_email(ambiente))
+    contador = iter(range(10 ** 9))
+
+    def executa():
+        config.set_config_value('email.max_tentativas', next(contador))
+        config.save_config()
+
+    yield executa
+
+
+# --------------------------------------------------------------------- arquivo
+
+# Criar 1000 pastas depende só do disco: em máquinas virtuais o mesmo código varia de 1x a 8x
+@caso('arquivo.cria_pastas_lote[1000 novas]', iteracoes=10, aquecimento=1, tolerancia=3.0)
+def _(ambiente):
+    from modules.arquivo import ManipulaPastas
+
+    manipula = ManipulaPastas()
+    base = ambiente.subpasta('cria_pastas')
+    rodadas = iter(range(10 ** 6))
+
+    def prepara():
+        manipula.limpar_cache_pastas()
+        raiz = os.path.join(base, str(next(rodadas)))
+        return [os.path.join(raiz, f'loja{loja}', f'2024-01-{dia:02d}') for loja in range(200) for dia in range(1, 6)]
+
+    yield prepara, lambda pastas: manipula.cria_pastas_lote(pastas, workers=8)['criadas']
+
+
+@caso('arquivo.cria_pastas_lote[1000 em cache]', iteracoes=200)
+def _(ambiente):
+    from modules.arquivo import ManipulaPastas
+
+    manipula = ManipulaPastas()
+    raiz = ambiente.subpasta('cria_pastas_cache')
+    pastas = [os.path.join(raiz, f'loja{loja}', f'2024-01-{dia:02d}') for loja in range(200) for dia in range(1, 6)]
+    manipula.cria_pastas_lote(pastas)
+    yield lambda: manipula.cria_pastas_lote(pastas)['em_cache']
+
+
+@caso('arquivo.limpa_diretorio[2000 arquivos]', iteracoes=5, aquecimento=1)
+def _(ambiente):
+    from modules.arquivo import ManipulaPastas
+
+    manipula = ManipulaPastas()
+    pasta = ambiente.subpasta('limpa_diretorio')
+
+    def prepara():
+        for subpasta in range(10):
+            caminho = os.path.join(pasta, f'sub{subpasta}')
+            os.makedirs(caminho, exist_ok=True)
+            for indice in range(200):
+                with open(os.path.join(caminho, f'log{indice}.log'), 'w') as arquivo:
+                    arquivo.write('x' * 100)
+
+    yield prepara, lambda _: manipula.limpa_diretorio(pasta, recursivo=True, workers=8)['arquivos']
+
+
+@caso('arquivo.retencao_aplica_cota[incremental, 2000 arquivos]', iteracoes=50)
+def _(ambiente):
+    from modules.arquivo import RetencaoPastas
+
+    raiz = ambiente.subpasta('retencao')
+    for subpasta in range(50):
+        caminho = os.path.join(raiz, f'robo{subpasta}')
+        os.makedirs(caminho, exist_ok=True)
+        for indice in range(40):
+            with open(os.path.join(caminho, f'saida{indice}.csv'), 'w') as arquivo:
+                arquivo.write('x' * 100)
+    retencao = RetencaoPastas()
+    retencao.aplica_cota(raiz, 10 ** 12)
+    yield lambda: retencao.aplica_cota(raiz, 10 ** 12)
+    retencao.close()
+
+
+# ------------------------------------------------------------------ connection
+
+def _conexao(ambiente, **opcoes):
+    ambiente.banco
+    from modules.connection import Connection
+
+    conexao = Connection('bench', 'bench', 'robo', 'senha', **opcoes)
+    conexao.connect()
+    conexao.execute_query(
+        'CREATE TABLE IF NOT EXISTS lojas (id INTEGER PRIMARY KEY, nome TEXT, cidade TEXT, ativa INTEGER)'
+    )
+    if not conexao.execute_read_query('SELECT COUNT(*) FROM lojas')[0][0]:
+        conexao.bulk_insert('lojas', ['id', 'nome', 'cidade', 'ativa'],
+                            ((i, f'Loja {i}', f'Cidade {i % 50}', i % 2) for i in range(10000)))
+    return conexao
+
+
+@caso('connection.pool_connect_disconnect', iteracoes=2000)
+def _(ambiente):
+    conexao = _conexao(ambiente)
+    conexao.disconnect()
+
+    def executa():
+        conexao.connect()
+        conexao.disconnect()
+
+    yield executa
+
+
+@caso('connection.execute_read_query[por chave]', iteracoes=2000)
+def _(ambiente):
+    conexao = _conexao(ambiente)
+    ids = iter(range(10 ** 9))
+    yield lambda: conexao.execute_read_query('SELECT * FROM lojas WHERE id = %s', (next(ids) % 10000,))
+    conexao.disconnect()
+
+
+@caso('connection.execute_read_query[QueryCache]', iteracoes=5000)
+def _(ambiente):
+    ambiente.banco
+    from modules.connection import QueryCache
+
+    conexao = _conexao(ambiente, cache=QueryCache())
+    ids = iter(range(10 ** 9))
+    yield lambda: conexao.execute_read_query('SELECT * FROM lojas WHERE id = %s', (next(ids) % 100,))
+    conexao.disconnect()
+
+
+@caso('connection.iter_read_query[10000 linhas]', iteracoes=20)
+def _(ambiente):
+    conexao = _conexao(ambiente)
+    yield lambda: sum(1 for _ in conexao.iter_read_query('SELECT * FROM lojas', batch_size=1000))
+    conexao.disconnect()
+
+
+@caso('connection.bulk_insert[5000 linhas]', iteracoes=10, aquecimento=1)
+def _(ambiente):
+    conexao = _conexao(ambiente)
+    conexao.execute_query('CREATE TABLE IF NOT EXISTS vendas (loja INTEGER, valor REAL, dia TEXT)')
+    linhas = [(i % 100, i * 1.5, '2024-01-01') for i in range(5000)]
+    yield lambda: conexao.bulk_insert('vendas', ['loja', 'valor', 'dia'], linhas)['rows']
+    conexao.disconnect()
+
+
+@caso('connection.execute_many[5000 linhas]', iteracoes=10, aquecimento=1)
+def _(ambiente):
+    conexao = _conexao(ambiente)
+    conexao.execute_query('CREATE TABLE IF NOT EXISTS vendas (loja INTEGER, valor REAL, dia TEXT)')
+    linhas = [(i % 100, i * 1.5, '2024-01-01') for i in range(5000)]
+    yield lambda: conexao.execute_many(
+        'INSERT INTO vendas (loja, valor, dia) VALUES (%s, %s, %s)', linhas
+    )['rows']
+    conexao.disconnect()
+
+
+@caso('connection.async_execute_read_query[20 em gather]', iteracoes=100)
+def _(ambiente):
+    _conexao(ambiente).disconnect()
+    from modules.connection import AsyncConnection
+
+    async def busca(loja):
+        async with AsyncConnection('bench', 'bench', 'robo', 'senha', max_size=8) as conexao:
+            return await conexao.execute_read_query('SELECT nome FROM lojas WHERE id = %s', (loja,))
+
+    async def consultas():
+        resultados = await asyncio.gather(*(busca(loja) for loja in range(20)))
+        if resultados != [[(f'Loja {loja}',)] for loja in range(20)]:
+            raise AssertionError('AsyncConnection retornou linhas diferentes das gravadas')
+        return len(resultados)
+
+    # Cada asyncio.run cria um loop novo: o pool do loop anterior não pode ser reaproveitado
+    asyncio.run(consultas())
+    yield lambda: asyncio.run(consultas())
+
+
+# ----------------------------------------------------------------------- email
+
+@caso('email.template_render', iteracoes=5000, aquecimento=50)
+def _(ambiente):
+    from modules.email import Template
+
+    template = Template('<p>{NomeRobo} concluiu o processo em {data}.</p><p>{mensagem}</p>' * 5)
+    contexto = {'NomeRobo': 'Benchmark', 'data': '01/01/2024', 'mensagem': 'Tudo certo.'}
+    yield lambda: template.render(contexto)
+
+
+@caso('email.enviar_email[sessão persistente]', iteracoes=300)
+def _(ambiente):
+    from modules.email import EnviaEmail
+
+    enviador = EnviaEmail(_config_email(ambiente, ambiente.smtp.porta))
+    yield lambda: enviador.enviar_email('destino@exemplo.com', 'Relatório', '<p>Concluído.</p>')
+    enviador.fechar()
+
+
+@caso('email.enviar_lote[50 mensagens]', iteracoes=10, aquecimento=1)
+def _(ambiente):
+    from modules.email import EnviaEmail
+
+    enviador = EnviaEmail(_config_email(ambiente, ambiente.smtp.porta))
+    mensagens = [
+        {'destinatario': f'loja{i}@exemplo.com', 'assunto': f'Loja {i}', 'mensagem': f'<p>Relatório da loja {i}.</p>'}
+        for i in range(50)
+    ]
+    yield lambda: sum(resultado['enviado'] for resultado in enviador.enviar_lote(mensagens))
+    enviador.fechar()
+
+
+@caso('email.enviar_email[anexo 4MB em streaming]', iteracoes=10, aquecimento=1)
+def _(ambiente):
+    from modules.email import EnviaEmail
+
+    anexo = os.path.join(ambiente.subpasta('email'), 'relatorio.csv')
+    with open(anexo, 'w') as arquivo:
+        arquivo.write('loja;valor;dia\n' * (4 * 1024 * 1024 // 15))
+    enviador = EnviaEmail(_config_email(ambiente, ambiente.smtp.porta, anexo_streaming_mb=1))
+    yield lambda: enviador.enviar_email('destino@exemplo.com', 'Relatório', '<p>Segue.</p>', anexo=anexo)
+    enviador.fechar()
+
+
+# --------------------------------------------------------------------- chamado
+
+def _assistente(ambiente, latencia=0.002, cache=None):
+    from modules.chamado import AssistenteChamado
+    import standins
+
+    modelo = {'model': 'falso', 'temperature': 0.0, 'max_tokens': 256, 'prompt_zanthus': 'Gere o chamado.'}
+    if cache:
+        modelo['cache'] = {'caminho': os.path.join(ambiente.subpasta('chamado'), 'cache.sqlite'), 'ttl': 3600}
+    caminho = ambiente.config(f'config_chamado_{latencia}_{bool(cache)}.json', {
+        'api_keys': {'OPENAI_API_KEY': 'sk-falsa'}, 'model': modelo,
+    })
+    assistente = AssistenteChamado(caminho)
+    # Os componentes da chain são compartilhados por configuração de modelo: a chain falsa entra no lugar do LLM
+    chave = (assistente.model, assistente.temperature, assistente.max_tokens, assistente.api_key)
+    AssistenteChamado._componentes_compartilhados[chave] = {
+        'prompt': None, 'llm': None, 'parser': None, 'chain': standins.ChainFalsa(latencia),
+    }
+    return assistente
+
+
+def _confere_textos(textos, entradas):
+    # A chain falsa ecoa a entrada: confere que cada texto corresponde à sua entrada, na ordem
+    import standins
+
+    esperado = [standins.ChainFalsa.resposta(entrada) for entrada in entradas]
+    if textos != esperado:
+        raise AssertionError('AssistenteChamado retornou textos diferentes dos gerados pela chain')
+    return len(textos)
+
+
+@caso('chamado.gerar_texto_chamado[LLM 2ms]', iteracoes=200)
+def _(ambiente):
+    assistente = _assistente(ambiente)
+    yield lambda: _confere_textos([assistente.gerar_texto_chamado('Serviço mirage parado')], ['Serviço mirage parado'])
+
+
+@caso('chamado.gerar_texto_chamado[cache SQLite]', iteracoes=2000)
+def _(ambiente):
+    assistente = _assistente(ambiente, cache=True)
+    assistente.gerar_texto_chamado('Serviço mirage parado')
+    yield lambda: _confere_textos([assistente.gerar_texto_chamado('Serviço mirage parado')], ['Serviço mirage parado'])
+    assistente.cache.fechar()
+    # Só a chamada de preparação pode ter chegado ao modelo: as medidas vêm do cache
+    if assistente.chain.chamadas != 1:
+        raise AssertionError(f'cache não evitou o LLM: {assistente.chain.chamadas} chamadas')
+
+
+@caso('chamado.gerar_textos_chamado[32 em lote, LLM 2ms]', iteracoes=20)
+def _(ambiente):
+    assistente = _assistente(ambiente)
+    entradas = [f'Serviço {i} parado' for i in range(32)]
+    yield lambda: _confere_textos(assistente.gerar_textos_chamado(entradas, max_concurrency=8), entradas)
+
+
+@caso('chamado.agerar_textos_chamado[32 em lote, LLM 2ms]', iteracoes=20)
+def _(ambiente):
+    assistente = _assistente(ambiente)
+    entradas = [f'Serviço {i} parado' for i in range(32)]
+    yield lambda: _confere_textos(asyncio.run(assistente.agerar_textos_chamado(entradas, max_concurrency=8)), entradas)
+
+
+@caso('chamado.gerar_texto_chamado_stream[tempo até o 1º trecho]', iteracoes=100)
+def _(ambiente):
+    assistente = _assistente(ambiente)
+    # Antes de medir só o 1º trecho, confere que os trechos juntos formam a resposta inteira
+    _confere_textos([''.join(assistente.gerar_texto_chamado_stream('Serviço mirage parado', usar_cache=False))],
+                    ['Serviço mirage parado'])
+
+    yield lambda: next(assistente.gerar_texto_chamado_stream('Serviço mirage parado', usar_cache=False))
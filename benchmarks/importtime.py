@@ -0,0 +1,94 @@
+# Autor: Yago Assis Mendes Faria
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+'''
+ Benchmark de inicialização a frio de cada componente de modules
+
+    Para cada componente, executa um interpretador novo com
+    "python -X importtime -c '<import>'" e soma o tempo acumulado das
+    importações disparadas pelo comando (o custo do próprio interpretador
+    fica de fora). Também lista quais dependências pesadas foram carregadas,
+    para provar que usar um componente não importa as dos outros.
+    Uso:
+        python benchmarks/importtime.py [--repeticoes 5]
+'''
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMPONENTES = {
+    'pacote': 'import modules',
+    'config': 'from modules import ConfigHandler',
+    'arquivo': 'from modules import ManipulaPastas',
+    'criptografia': 'from modules import Criptografia',
+    'email': 'from modules import EnviaEmail',
+    'connection': 'from modules import Connection',
+    'async_connection': 'from modules import AsyncConnection',
+    'chamado': 'from modules import AssistenteChamado',
+}
+
+DEPENDENCIAS_PESADAS = (
+    'mysql.connector', 'aiomysql', 'langchain_openai', 'langchain_core', 'openai',
+    'dotenv', 'numpy', 'smtplib', 'sqlite3',
+)
+
+
+def mede(comando):
+    # Retorna (microssegundos das importações do comando, dependências pesadas carregadas) ou None se falhar
+    verificacao = f'import sys; print(",".join(m for m in {DEPENDENCIAS_PESADAS!r} if m in sys.modules))'
+    ambiente = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [RAIZ, os.environ.get('PYTHONPATH')])))
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'{comando}; {verificacao}'],
+        capture_output=True, text=True, cwd=RAIZ, env=ambiente,
+    )
+    if processo.returncode != 0:
+        return None
+    # O interpretador já importa os módulos de inicialização antes do -c: só contam as linhas depois do último
+    # import de site, e só as de primeiro nível (sem recuo), pois o acumulado já inclui os módulos filhos
+    linhas = processo.stderr.splitlines()
+    inicio = max((i for i, linha in enumerate(linhas) if linha.rstrip().endswith('| site')), default=-1) + 1
+    total = 0
+    for linha in linhas[inicio:]:
+        if not linha.startswith('import time:') or '|' not in linha:
+            continue
+        _, acumulado, modulo = linha[len('import time:'):].split('|', 2)
+        if acumulado.strip().isdigit() and not modulo[1:].startswith(' '):
+            total += int(acumulado)
+    carregadas = processo.stdout.strip().splitlines()[-1] if processo.stdout.strip() else ''
+    return total, carregadas
+
+
+def executa(repeticoes=5):
+    # Retorna {componente: {'mediana_ms', 'min_ms', 'dependencias'}}; componentes sem dependência instalada ficam None
+    resultados = {}
+    for nome, comando in COMPONENTES.items():
+        medicoes = [mede(comando) for _ in range(repeticoes)]
+        if any(medicao is None for medicao in medicoes):
+            resultados[nome] = None
+            continue
+        tempos = [total / 1000 for total, _ in medicoes]
+        resultados[nome] = {
+            'mediana_ms': round(statistics.median(tempos), 2),
+            'min_ms': round(min(tempos), 2),
+            'dependencias': medicoes[-1][1],
+        }
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'componente':<18}{'mediana':>10}{'mínimo':>10}  dependências carregadas")
+    for nome, resultado in executa(args.repeticoes).items():
+        if resultado is None:
+            print(f'{nome:<18}{"dependência não instalada":>20}')
+            continue
+        print(f"{nome:<18}{resultado['mediana_ms']:>8.2f}ms{resultado['min_ms']:>8.2f}ms  {resultado['dependencias'] or '-'}")
+
+
+if __name__ == '__main__':
+    main()
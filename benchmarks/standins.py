@@ -0,0 +1,367 @@
+# Autor: Yago Assis Mendes Faria
+import asyncio
+import os
+import shutil
+import socketserver
+import sqlite3
+import ssl
+import subprocess
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+'''
+ Substitutos locais usados pelo benchmark (nada daqui é usado pelo pacote)
+
+    Permitem medir as classes de modules sem rede nem servidores externos:
+        instala_mysql_sqlite: registra um mysql.connector mínimo sobre sqlite3
+        instala_aiomysql_sqlite: o mesmo para o aiomysql, com o SQLite rodando em threads
+        ServidorSMTPLocal: servidor SMTP em thread, com STARTTLS e AUTH, que descarta as mensagens
+        ChainFalsa: chain no formato do langchain (invoke/batch/stream e versões async) com latência simulada
+'''
+
+
+class Error(Exception):
+    pass
+
+
+class PoolError(Error):
+    pass
+
+
+def instala_mysql_sqlite(caminho):
+    # Registra em sys.modules um mysql.connector cujas conexões abrem o banco SQLite em caminho.
+    # Precisa ser chamado antes de importar modules.connection
+    if 'modules.connection.connection' in sys.modules:
+        raise RuntimeError('modules.connection já foi importado com o driver real')
+    errors = types.ModuleType('mysql.connector.errors')
+    errors.Error = Error
+    errors.PoolError = PoolError
+    connector = types.ModuleType('mysql.connector')
+    connector.Error = Error
+    connector.errors = errors
+    connector.connect = lambda **kwargs: _ConexaoSQLite(caminho)
+    mysql = types.ModuleType('mysql')
+    mysql.connector = connector
+    sys.modules.update({'mysql': mysql, 'mysql.connector': connector, 'mysql.connector.errors': errors})
+    with sqlite3.connect(caminho) as conexao:
+        conexao.execute('PRAGMA journal_mode=WAL')
+
+
+class _ConexaoSQLite:
+    # Só o que Connection e ConnectionPool usam da conexão do mysql-connector
+    MAX_ALLOWED_PACKET = 64 * 1024 * 1024
+
+    def __init__(self, caminho):
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, timeout=30)
+        self._aberta = True
+
+    def cursor(self, buffered=None, prepared=None):
+        return _CursorSQLite(self._conexao.cursor())
+
+    @property
+    def in_transaction(self):
+        return self._conexao.in_transaction
+
+    def is_connected(self):
+        return self._aberta
+
+    def commit(self):
+        self._conexao.commit()
+
+    def rollback(self):
+        self._conexao.rollback()
+
+    def consume_results(self):
+        pass
+
+    def reset_session(self):
+        # O SQLite não tem estado de sessão a reiniciar
+        pass
+
+    def close(self):
+        self._aberta = False
+        self._conexao.close()
+
+
+class _CursorSQLite:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._linhas = None
+
+    def execute(self, query, params=None):
+        self._linhas = None
+        if query.strip().upper() == 'SELECT @@MAX_ALLOWED_PACKET':
+            self._linhas = [(_ConexaoSQLite.MAX_ALLOWED_PACKET,)]
+            return
+        try:
+            self._cursor.execute(query.replace('%s', '?'), params or ())
+        except sqlite3.Error as e:
+            raise Error(str(e))
+
+    def executemany(self, query, linhas):
+        try:
+            self._cursor.executemany(query.replace('%s', '?'), linhas)
+        except sqlite3.Error as e:
+            raise Error(str(e))
+
+    def fetchone(self):
+        if self._linhas is not None:
+            return self._linhas.pop(0) if self._linhas else None
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        if self._linhas is not None:
+            linhas, self._linhas = self._linhas, []
+            return linhas
+        return self._cursor.fetchall()
+
+    def fetchmany(self, tamanho):
+        return self._cursor.fetchmany(tamanho)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+def instala_aiomysql_sqlite(caminho):
+    # Registra em sys.modules um aiomysql cujo pool abre conexões no banco SQLite em caminho.
+    # Precisa ser chamado antes de importar modules.connection.async_connection
+    if 'modules.connection.async_connection' in sys.modules:
+        raise RuntimeError('modules.connection.async_connection já foi importado com o driver real')
+    aiomysql = types.ModuleType('aiomysql')
+    aiomysql.Error = Error
+
+    async def create_pool(minsize=1, maxsize=10, **kwargs):
+        return _PoolAssincrono(caminho, maxsize)
+
+    aiomysql.create_pool = create_pool
+    sys.modules['aiomysql'] = aiomysql
+
+
+class _PoolAssincrono:
+    # Só o que AsyncConnection usa de aiomysql.Pool; as conexões ficam presas ao loop que criou o pool
+    def __init__(self, caminho, maxsize):
+        self._caminho = caminho
+        self._loop = asyncio.get_running_loop()
+        self._vagas = asyncio.Semaphore(maxsize)
+        self._ociosas = []
+        self.closed = False
+
+    async def acquire(self):
+        if asyncio.get_running_loop() is not self._loop:
+            raise Error('pool usado fora do event loop que o criou')
+        await self._vagas.acquire()
+        if self._ociosas:
+            return self._ociosas.pop()
+        return _ConexaoAssincrona(await asyncio.to_thread(_ConexaoSQLite, self._caminho))
+
+    def release(self, conexao):
+        self._ociosas.append(conexao)
+        self._vagas.release()
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        for conexao in self._ociosas:
+            conexao._conexao.close()
+        self._ociosas.clear()
+
+
+class _ConexaoAssincrona:
+    def __init__(self, conexao):
+        self._conexao = conexao
+
+    async def cursor(self):
+        return _CursorAssincrono(self._conexao.cursor())
+
+    def get_transaction_status(self):
+        return self._conexao.in_transaction
+
+    async def commit(self):
+        await asyncio.to_thread(self._conexao.commit)
+
+    async def rollback(self):
+        await asyncio.to_thread(self._conexao.rollback)
+
+
+class _CursorAssincrono:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    async def execute(self, query, params=None):
+        await asyncio.to_thread(self._cursor.execute, query, params)
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+    async def close(self):
+        self._cursor.close()
+
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ServidorSMTPLocal:
+    # Servidor SMTP em 127.0.0.1 numa porta livre; conta mensagens e bytes recebidos.
+    # STARTTLS usa um certificado autoassinado gerado com o openssl da máquina
+    def __init__(self, pasta):
+        if shutil.which('openssl') is None:
+            raise RuntimeError('openssl não encontrado para gerar o certificado do STARTTLS')
+        certificado = os.path.join(pasta, 'smtp.pem')
+        chave = os.path.join(pasta, 'smtp.key')
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-keyout', chave,
+             '-out', certificado, '-days', '1', '-subj', '/CN=localhost'],
+            check=True, capture_output=True,
+        )
+        self.contexto = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.contexto.load_cert_chain(certificado, chave)
+        self.mensagens = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        servidor_smtp = self
+
+        class Sessao(socketserver.StreamRequestHandler):
+            def handle(self):
+                servidor_smtp._atende(self)
+
+        self._servidor = _ServidorTCP(('127.0.0.1', 0), Sessao)
+        self.porta = self._servidor.server_address[1]
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+
+    def fechar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def _atende(self, sessao):
+        conexao = sessao.connection
+        entrada = conexao.makefile('rb')
+        tls = False
+
+        def responde(*linhas):
+            conexao.sendall(b''.join(linha.encode() + b'\r\n' for linha in linhas))
+
+        responde('220 localhost ESMTP benchmark')
+        while True:
+            linha = entrada.readline()
+            if not linha:
+                return
+            comando = linha[:4].upper()
+            if comando == b'EHLO':
+                extensoes = ['250-AUTH PLAIN LOGIN', '250 8BITMIME']
+                responde('250-localhost', *([] if tls else ['250-STARTTLS']), *extensoes)
+            elif comando == b'STAR':
+                responde('220 pronto para TLS')
+                conexao = self.contexto.wrap_socket(conexao, server_side=True)
+                entrada = conexao.makefile('rb')
+                tls = True
+            elif comando == b'AUTH':
+                responde('235 autenticado')
+            elif comando == b'DATA':
+                responde('354 fim com <CRLF>.<CRLF>')
+                tamanho = 0
+                while True:
+                    linha = entrada.readline()
+                    if not linha or linha == b'.\r\n':
+                        break
+                    tamanho += len(linha)
+                with self._lock:
+                    self.mensagens += 1
+                    self.bytes += tamanho
+                responde('250 mensagem aceita')
+            elif comando == b'QUIT':
+                responde('221 tchau')
+                return
+            elif comando in (b'HELO', b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                responde('250 ok')
+            else:
+                responde('502 comando não implementado')
+
+
+class ErroLLMFalso(RuntimeError):
+    pass
+
+
+class ChainFalsa:
+    # Responde como prompt | llm | StrOutputParser, esperando `latencia` segundos por chamada.
+    # `chamadas` conta as chamadas ao "modelo", para casos e testes conferirem o uso do cache;
+    # `latencias` ({input: segundos}) muda a espera de entradas específicas e as entradas em
+    # `falhar_em` lançam ErroLLMFalso, como uma chamada ao modelo que falhou
+    def __init__(self, latencia=0.002, partes=10, latencias=None, falhar_em=()):
+        self.latencia = latencia
+        self.partes = partes
+        self.latencias = dict(latencias or {})
+        self.falhar_em = set(falhar_em)
+        self.chamadas = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resposta(input_text):
+        return f'Prezados, segue o chamado: {input_text}'
+
+    def _espera(self, entrada):
+        return self.latencias.get(entrada['input'], self.latencia)
+
+    def _resposta(self, entrada):
+        with self._lock:
+            self.chamadas += 1
+        if entrada['input'] in self.falhar_em:
+            raise ErroLLMFalso(f"falha simulada para {entrada['input']!r}")
+        return self.resposta(entrada['input'])
+
+    def _pedacos(self, resposta):
+        tamanho = max(1, len(resposta) // self.partes)
+        return [resposta[i:i + tamanho] for i in range(0, len(resposta), tamanho)]
+
+    def invoke(self, entrada, config=None):
+        time.sleep(self._espera(entrada))
+        return self._resposta(entrada)
+
+    def batch(self, entradas, config=None, return_exceptions=False):
+        workers = (config or {}).get('max_concurrency') or len(entradas) or 1
+
+        def chama(entrada):
+            try:
+                return self.invoke(entrada)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(chama, entradas))
+
+    def stream(self, entrada, config=None):
+        pedacos = self._pedacos(self._resposta(entrada))
+        for pedaco in pedacos:
+            time.sleep(self._espera(entrada) / len(pedacos))
+            yield pedaco
+
+    async def ainvoke(self, entrada, config=None):
+        await asyncio.sleep(self._espera(entrada))
+        return self._resposta(entrada)
+
+    async def abatch(self, entradas, config=None, return_exceptions=False):
+        limite = asyncio.Semaphore((config or {}).get('max_concurrency') or len(entradas) or 1)
+
+        async def chama(entrada):
+            async with limite:
+                return await self.ainvoke(entrada)
+
+        return await asyncio.gather(*(chama(entrada) for entrada in entradas), return_exceptions=return_exceptions)
+
+    async def astream(self, entrada, config=None):
+        pedacos = self._pedacos(self._resposta(entrada))
+        for pedaco in pedacos:
+            await asyncio.sleep(self._espera(entrada) / len(pedacos))
+            yield pedaco
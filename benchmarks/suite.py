@@ -0,0 +1,314 @@
+# Autor: Yago Assis Mendes Faria
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+'''
+ Suíte de benchmarks dos caminhos críticos de cada componente de modules
+
+    Roda offline, com substitutos locais (benchmarks/standins.py): SQLite no
+    lugar do MySQL, um servidor SMTP local e uma chain falsa no lugar do LLM.
+    Para cada caso mede a vazão (itens/s) e os percentis de latência
+    (p50/p95/p99) e compara com o baseline gravado em benchmarks/baseline.json.
+    Operações de microssegundos são cronometradas em blocos de chamadas, como
+    no timeit, e a latência de cada amostra é a média do bloco.
+    Uso:
+        python benchmarks/suite.py                      # roda tudo e compara com o baseline
+        python benchmarks/suite.py -k connection        # só os casos cujo nome contém "connection"
+        python benchmarks/suite.py --salvar-baseline    # grava os resultados como novo baseline
+    Sai com código 1 quando algum caso falha (qualquer exceção que não seja a falta de
+    uma dependência) ou continua mais lento que o baseline além da tolerância depois
+    de medido de novo (--confirmacoes).
+'''
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [RAIZ, os.path.dirname(os.path.abspath(__file__))]
+
+import standins  # noqa: E402
+from casos import CASOS  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# Uma amostra dura ao menos 1 ms (operações mais rápidas são repetidas dentro dela) e cada
+# rodada tem ao menos AMOSTRAS_MINIMAS amostras, salvo casos com menos iterações que isso
+AMOSTRA_MINIMA_NS = 1_000_000
+AMOSTRAS_MINIMAS = 20
+
+
+class Ambiente:
+    # Recursos compartilhados entre os casos, criados sob demanda e liberados no fim
+    def __init__(self):
+        self.pasta = tempfile.mkdtemp(prefix='bench-helpers-')
+        self._smtp = None
+        self._banco = None
+
+    def subpasta(self, nome):
+        caminho = os.path.join(self.pasta, nome)
+        os.makedirs(caminho, exist_ok=True)
+        return caminho
+
+    def config(self, nome, dados):
+        caminho = os.path.join(self.pasta, nome)
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(dados, arquivo)
+        return caminho
+
+    @property
+    def smtp(self):
+        if self._smtp is None:
+            self._smtp = standins.ServidorSMTPLocal(self.subpasta('smtp'))
+        return self._smtp
+
+    @property
+    def banco(self):
+        # Caminho do banco SQLite por trás do mysql.connector substituto
+        if self._banco is None:
+            self._banco = os.path.join(self.pasta, 'banco.sqlite')
+            standins.instala_mysql_sqlite(self._banco)
+            standins.instala_aiomysql_sqlite(self._banco)
+        return self._banco
+
+    def fechar(self):
+        if self._smtp is not None:
+            self._smtp.fechar()
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+
+def percentil(ordenados, p):
+    # Percentil pelo método do posto mais próximo
+    if not ordenados:
+        return 0.0
+    indice = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados) + 0.5)) - 1))
+    return ordenados[indice]
+
+
+def calibra(executa):
+    # Como o timeit.autorange: quantas chamadas seguidas (1, 2, 5, 10, 20, 50...) levam ao menos
+    # AMOSTRA_MINIMA_NS, para que operações de microssegundos sejam cronometradas em blocos
+    numero = 1
+    while True:
+        for fator in (1, 2, 5):
+            vezes = numero * fator
+            inicio = time.perf_counter_ns()
+            for _ in range(vezes):
+                executa()
+            if time.perf_counter_ns() - inicio >= AMOSTRA_MINIMA_NS:
+                return vezes
+        numero *= 10
+
+
+def mede(operacao, iteracoes, aquecimento):
+    # Cada amostra cronometra `numero` chamadas seguidas e vale a média delas; operações com
+    # preparação (prepara, executa) são sempre medidas uma chamada por amostra
+    prepara, executa = operacao if isinstance(operacao, tuple) else (None, operacao)
+
+    def uma_vez():
+        argumento = prepara() if prepara else None
+        inicio = time.perf_counter_ns()
+        itens = executa(argumento) if prepara else executa()
+        contagem = itens if isinstance(itens, int) and not isinstance(itens, bool) else 1
+        return time.perf_counter_ns() - inicio, contagem
+
+    def bloco(numero):
+        total_itens = 0
+        inicio = time.perf_counter_ns()
+        for _ in range(numero):
+            itens = executa()
+            total_itens += itens if isinstance(itens, int) and not isinstance(itens, bool) else 1
+        return time.perf_counter_ns() - inicio, total_itens
+
+    for _ in range(aquecimento):
+        uma_vez()
+    numero = 1 if prepara else calibra(executa)
+    amostras = min(iteracoes, max(AMOSTRAS_MINIMAS, -(-iteracoes // numero)))
+    latencias = []
+    total_itens = total_ns = 0
+    for _ in range(amostras):
+        duracao, itens = uma_vez() if numero == 1 else bloco(numero)
+        latencias.append(duracao / numero / 1e6)
+        total_itens += itens
+        total_ns += duracao
+    latencias.sort()
+    return {
+        'iteracoes': amostras * numero,
+        'numero': numero,
+        'itens_por_s': round(total_itens / (total_ns / 1e9), 2) if total_ns else 0.0,
+        'p50_ms': round(percentil(latencias, 50), 6),
+        'p95_ms': round(percentil(latencias, 95), 6),
+        'p99_ms': round(percentil(latencias, 99), 6),
+    }
+
+
+def executa(filtro=None, escala=1.0, rodadas=3, nomes=None, mediana=False):
+    # Roda os casos (os que contêm filtro, ou só os de nomes) e retorna {nome: resultado}; casos que
+    # não puderam rodar por falta de dependência trazem {'ignorado': motivo}, e os que falharam
+    # (exceção no cenário, na operação ou nas conferências do caso) trazem {'erro': motivo}.
+    # Cada caso é medido em várias rodadas e fica a de menor p50, como no timeit: em máquinas
+    # compartilhadas o ruído só deixa as medições mais lentas, nunca mais rápidas. Para o baseline
+    # (mediana=True) fica a rodada mediana, para ele não guardar uma medição de sorte
+    resultados = {}
+    ambiente = Ambiente()
+    try:
+        for nome, funcao, iteracoes, aquecimento, _ in CASOS:
+            if (filtro and filtro not in nome) or (nomes is not None and nome not in nomes):
+                continue
+            # As classes imprimem uma linha por operação: o que elas escrevem não entra no relatório
+            with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+                cenario = operacao = None
+                try:
+                    cenario = funcao(ambiente)
+                    operacao = next(cenario)
+                    medicoes = [mede(operacao, max(1, int(iteracoes * escala)), aquecimento) for _ in range(rodadas)]
+                    medicoes.sort(key=lambda medicao: medicao['p50_ms'])
+                    resultados[nome] = medicoes[len(medicoes) // 2] if mediana else medicoes[0]
+                    next(cenario, None)
+                except ImportError as e:
+                    resultados[nome] = {'ignorado': f'dependência não instalada: {e.name}'}
+                except Exception as e:
+                    resultados[nome] = {'erro': f'{type(e).__name__}: {e}'}
+                finally:
+                    # Libera os objetos do caso ainda aqui dentro, para o que imprimem ao serem destruídos
+                    cenario = operacao = None
+    finally:
+        ambiente.fechar()
+    return resultados
+
+
+def compara(resultados, baseline, tolerancia, piso_ms=0.0):
+    # Retorna {nome: (variação do p50, variação da vazão, situação)} em relação ao baseline.
+    # Diferenças de p50 menores que piso_ms são tratadas como ruído, seja qual for a porcentagem;
+    # casos registrados com tolerância própria usam a deles
+    tolerancias = {nome: propria for nome, _, _, _, propria in CASOS if propria is not None}
+    comparacao = {}
+    for nome, atual in resultados.items():
+        limite = tolerancias.get(nome, tolerancia)
+        base = baseline.get(nome)
+        if 'erro' in atual:
+            comparacao[nome] = (None, None, 'ERRO')
+        elif 'ignorado' in atual:
+            comparacao[nome] = (None, None, 'ignorado')
+        elif not base or 'p50_ms' not in base:
+            comparacao[nome] = (None, None, 'novo')
+        else:
+            delta_p50 = atual['p50_ms'] / base['p50_ms'] - 1 if base['p50_ms'] else 0.0
+            delta_vazao = atual['itens_por_s'] / base['itens_por_s'] - 1 if base['itens_por_s'] else 0.0
+            # Só o p50 decide: a vazão vem da média e oscila com qualquer pausa isolada
+            if abs(atual['p50_ms'] - base['p50_ms']) < piso_ms:
+                situacao = 'ok'
+            elif delta_p50 > limite:
+                situacao = 'REGRESSÃO'
+            elif delta_p50 < -limite:
+                situacao = 'melhorou'
+            else:
+                situacao = 'ok'
+            comparacao[nome] = (delta_p50, delta_vazao, situacao)
+    return comparacao
+
+
+def confirma(nomes, escala, rodadas):
+    # Mede os casos de novo em um processo novo e retorna {nome: resultado}. O mesmo código pode
+    # ficar estável em tempos diferentes de um processo para outro (layout de memória, hash aleatório)
+    with tempfile.TemporaryDirectory(prefix='bench-helpers-') as pasta:
+        saida = os.path.join(pasta, 'confirmacao.json')
+        comando = [sys.executable, os.path.abspath(__file__), '--escala', str(escala), '--rodadas', str(rodadas),
+                   '--confirmacoes', '0', '--json', saida]
+        for nome in nomes:
+            comando += ['--caso', nome]
+        subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            with open(saida, 'r', encoding='utf-8') as arquivo:
+                return json.load(arquivo)['resultados']
+        except (OSError, ValueError):
+            return {}
+
+
+def imprime(resultados, comparacao):
+    largura = max([len(nome) for nome in resultados] + [4]) + 2
+    print(f"{'caso':<{largura}}{'itens/s':>13}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Δvazão':>9}{'Δp50':>9}  situação")
+    for nome, resultado in resultados.items():
+        delta_p50, delta_vazao, situacao = comparacao[nome]
+        if 'erro' in resultado:
+            print(f"{nome:<{largura}}ERRO: {resultado['erro']}")
+            continue
+        if 'ignorado' in resultado:
+            print(f"{nome:<{largura}}{resultado['ignorado']}")
+            continue
+        deltas = ''.join(f'{delta:>+9.0%}' if delta is not None else f"{'-':>9}" for delta in (delta_vazao, delta_p50))
+        print(
+            f"{nome:<{largura}}{resultado['itens_por_s']:>13,.1f}{resultado['p50_ms']:>10.3f}"
+            f"{resultado['p95_ms']:>10.3f}{resultado['p99_ms']:>10.3f}{deltas}  {situacao}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks dos helpers de modules')
+    parser.add_argument('-k', dest='filtro', help='roda só os casos cujo nome contém o texto')
+    parser.add_argument('--escala', type=float, default=1.0, help='multiplica o número de iterações')
+    parser.add_argument('--rodadas', type=int, default=3, help='rodadas por caso; vale a de menor p50 (a mediana no baseline)')
+    parser.add_argument('--baseline', default=BASELINE, help='arquivo JSON do baseline')
+    parser.add_argument('--salvar-baseline', action='store_true', help='grava os resultados como baseline')
+    parser.add_argument('--tolerancia', type=float, default=0.3, help='aumento de p50 aceito (0.3 = 30%%)')
+    parser.add_argument('--piso', type=float, default=0.005, help='diferença de p50 (ms) sempre tratada como ruído')
+    parser.add_argument('--caso', dest='casos', action='append', help='roda só o caso com este nome exato (repetível)')
+    parser.add_argument('--confirmacoes', type=int, default=3,
+                        help='vezes que um caso acima da tolerância é medido de novo antes de virar regressão')
+    parser.add_argument('--json', help='grava os resultados desta execução neste arquivo')
+    args = parser.parse_args()
+
+    nomes = set(args.casos) if args.casos else None
+    resultados = executa(args.filtro, args.escala, args.rodadas, nomes, mediana=args.salvar_baseline)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as arquivo:
+            baseline = json.load(arquivo).get('resultados', {})
+    comparacao = compara(resultados, baseline, args.tolerancia, args.piso)
+    # Uma lentidão passageira da máquina (ou um processo "azarado") afeta todos os casos medidos
+    # ali: os que passaram da tolerância são medidos de novo em outro processo, e vale o menor p50,
+    # antes de serem dados como regressão
+    for _ in range(0 if args.salvar_baseline else args.confirmacoes):
+        suspeitos = [nome for nome, (_, _, situacao) in comparacao.items() if situacao == 'REGRESSÃO']
+        if not suspeitos:
+            break
+        for nome, resultado in confirma(suspeitos, args.escala, args.rodadas).items():
+            if 'p50_ms' in resultado and resultado['p50_ms'] < resultados[nome]['p50_ms']:
+                resultados[nome] = resultado
+        comparacao = compara(resultados, baseline, args.tolerancia, args.piso)
+    imprime(resultados, comparacao)
+
+    documento = {
+        'ambiente': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'processador': platform.machine(),
+        },
+        'resultados': resultados,
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as arquivo:
+            json.dump(documento, arquivo, indent=2, ensure_ascii=False)
+    if args.salvar_baseline:
+        # Mantém no baseline os casos que não foram rodados agora (por causa de -k, por exemplo)
+        documento['resultados'] = {**baseline, **{
+            nome: resultado for nome, resultado in resultados.items() if 'p50_ms' in resultado
+        }}
+        with open(args.baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump(documento, arquivo, indent=2, ensure_ascii=False)
+        print(f'Baseline gravado em {args.baseline}')
+    regressoes = [nome for nome, (_, _, situacao) in comparacao.items() if situacao == 'REGRESSÃO']
+    erros = [nome for nome, (_, _, situacao) in comparacao.items() if situacao == 'ERRO']
+    if regressoes:
+        print(f"{len(regressoes)} caso(s) mais lento(s) que o baseline: {', '.join(regressoes)}")
+    if erros:
+        print(f"{len(erros)} caso(s) com erro: {', '.join(erros)}")
+    if regressoes or erros:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+# Autor: Yago Assis Mendes Faria
+'''
+ python_helpers: classes utilitárias para robôs de automação
+
+    Nenhum componente é importado junto com o pacote: cada classe (e as
+    dependências pesadas dela, como mysql-connector, langchain-openai ou
+    numpy) só é carregada no primeiro acesso. Um robô que só envia e-mail
+    não paga o custo de importar o banco de dados nem o LLM.
+
+        from modules import EnviaEmail              # importa só modules.email
+        from modules.connection import Connection   # importa só modules.connection
+'''
+from ._lazy import exporta_sob_demanda
+
+__getattr__, __dir__, __all__ = exporta_sob_demanda(globals(), {
+    'ManipulaPastas': '.arquivo',
+    'RetencaoPastas': '.arquivo',
+    'AssistenteChamado': '.chamado',
+    'CacheRespostas': '.chamado',
+    'ConfigHandler': '.config',
+    'Connection': '.connection',
+    'ConnectionPool': '.connection',
+    'QueryCache': '.connection',
+    'StatementMetrics': '.connection',
+    'PartialWriteError': '.connection',
+    'AsyncConnection': '.connection',
+    'Criptografia': '.criptografia',
+    'EnviaEmail': '.email',
+    'Template': '.email',
+}, subpacotes=('arquivo', 'chamado', 'config', 'connection', 'criptografia', 'email'))
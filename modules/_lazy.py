@@ -0,0 +1,35 @@
+# Autor: Yago Assis Mendes Faria
+import importlib
+
+'''
+ Importação sob demanda dos pacotes de modules
+
+    Gera o __getattr__ (PEP 562) e o __dir__ de um pacote a partir de um
+    mapa nome -> submódulo. O submódulo só é importado no primeiro acesso ao
+    nome, e o valor fica gravado no pacote para os acessos seguintes não
+    passarem mais pelo __getattr__.
+    Funções:
+        exporta_sob_demanda: tuple
+'''
+
+
+def exporta_sob_demanda(namespace, exports, subpacotes=()):
+    # namespace: globals() do pacote; exports: {nome: submódulo relativo, ex. '.connection'}
+    # Retorna (__getattr__, __dir__, __all__); __all__ lista só as classes exportadas
+    pacote = namespace['__name__']
+    nomes = sorted(set(exports) | set(subpacotes))
+
+    def __getattr__(nome):
+        if nome in subpacotes:
+            valor = importlib.import_module(f'.{nome}', pacote)
+        elif nome in exports:
+            valor = getattr(importlib.import_module(exports[nome], pacote), nome)
+        else:
+            raise AttributeError(f"module {pacote!r} has no attribute {nome!r}")
+        namespace[nome] = valor
+        return valor
+
+    def __dir__():
+        return nomes
+
+    return __getattr__, __dir__, sorted(exports)
@@ -0,0 +1,557 @@
+# Autor: Yago Assis Mendes Faria
+import os
+import fnmatch
+import json
+import queue
+import threading
+import time
+# concurrent.futures, zipfile, gzip, shutil e tempfile são importados nos métodos que os usam,
+# para quem só cria pastas não pagar o custo deles na inicialização
+
+
+#classe para criar pastas e limpar arquios
+
+class ManipulaPastas:
+    # Quantidade de arquivos enviada de uma vez para cada thread de remoção
+    TAMANHO_LOTE = 256
+    # Pastas que este processo já criou ou confirmou existirem (caminhos absolutos)
+    _pastas_criadas = set()
+    _lock_pastas = threading.Lock()
+
+    def __init__(self):
+        pass
+    
+    def cria_pastas(self, *pastas):
+        for pasta in pastas:
+            try:
+                os.makedirs(pasta)
+                print(f'Pasta criada: {pasta}')
+            except FileExistsError:
+                print(f'Pasta já existe: {pasta}')
+            self._registra_criadas([os.path.abspath(pasta)])
+
+    def cria_pastas_lote(self, pastas, workers=1):
+        # Cria muitas pastas de uma vez: remove duplicadas e pastas que são ancestrais de outras,
+        # cria cada pasta-mãe compartilhada uma única vez e depois as pastas finais com um mkdir cada.
+        # Pastas já criadas neste processo são puladas sem nenhuma chamada ao sistema de arquivos.
+        # workers > 1 distribui os mkdir em threads (útil em discos de rede).
+        # Retorna {'criadas', 'existentes', 'em_cache', 'erros'}, contando as pastas finais do lote
+        resumo = {'criadas': 0, 'existentes': 0, 'em_cache': 0, 'erros': 0}
+        caminhos = {os.path.abspath(pasta) for pasta in pastas}
+        with self._lock_pastas:
+            em_cache = caminhos & self._pastas_criadas
+        resumo['em_cache'] = len(em_cache)
+        caminhos -= em_cache
+
+        # Uma pasta que é ancestral de outra do lote é criada junto com a descendente
+        ancestrais = set()
+        for caminho in caminhos:
+            pai = os.path.dirname(caminho)
+            while pai not in ancestrais and pai != os.path.dirname(pai):
+                ancestrais.add(pai)
+                pai = os.path.dirname(pai)
+        finais = caminhos - ancestrais
+
+        with self._lock_pastas:
+            maes = {os.path.dirname(caminho) for caminho in finais} - self._pastas_criadas
+        maes_criadas = []
+        for mae in sorted(maes):
+            try:
+                os.makedirs(mae, exist_ok=True)
+                maes_criadas.append(mae)
+            except OSError as e:
+                print(f"The error '{e}' occurred")
+        self._registra_criadas(maes_criadas)
+
+        def cria(caminho):
+            try:
+                os.mkdir(caminho)
+                return 'criadas'
+            except FileExistsError:
+                return 'existentes' if os.path.isdir(caminho) else 'erros'
+            except OSError as e:
+                print(f"The error '{e}' occurred")
+                return 'erros'
+
+        if workers > 1 and len(finais) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                resultados = list(executor.map(cria, finais))
+        else:
+            resultados = [cria(caminho) for caminho in finais]
+        for caminho, resultado in zip(finais, resultados):
+            resumo[resultado] += 1
+        self._registra_criadas(
+            caminho for caminho, resultado in zip(finais, resultados) if resultado != 'erros'
+        )
+        return resumo
+
+    @classmethod
+    def limpar_cache_pastas(cls):
+        # Esquece as pastas registradas; use se outro processo puder apagá-las
+        with cls._lock_pastas:
+            cls._pastas_criadas.clear()
+
+    @classmethod
+    def _registra_criadas(cls, caminhos):
+        # Registra as pastas e seus ancestrais (que necessariamente existem) no cache do processo
+        with cls._lock_pastas:
+            for caminho in caminhos:
+                while caminho not in cls._pastas_criadas and caminho != os.path.dirname(caminho):
+                    cls._pastas_criadas.add(caminho)
+                    caminho = os.path.dirname(caminho)
+
+    def limpa_diretorio(self, diretorio, recursivo=False, idade_dias=None, tamanho_minimo=None,
+                        padrao=None, dry_run=False, workers=8):
+        # Remove os arquivos do diretório (sem apagar as pastas) e retorna um resumo:
+        # {'arquivos', 'bytes', 'erros', 'ignorados', 'segundos'}.
+        # Filtros opcionais: idade_dias (modificados há mais de N dias), tamanho_minimo (bytes)
+        # e padrao (glob ou lista de globs aplicados ao nome). Com dry_run nada é removido
+        resumo = {'arquivos': 0, 'bytes': 0, 'erros': 0, 'ignorados': 0, 'segundos': 0.0}
+        if not (os.path.exists(diretorio) and os.path.isdir(diretorio)):
+            print(f'Pasta não encontrada: {diretorio}')
+            return resumo
+
+        inicio = time.perf_counter()
+        padroes = [padrao] if isinstance(padrao, str) else list(padrao or [])
+        limite_mtime = time.time() - idade_dias * 86400 if idade_dias is not None else None
+
+        def selecionados():
+            # Percorre o diretório em streaming com os.scandir, sem montar a lista completa em memória
+            for entrada in self._percorre(diretorio, recursivo):
+                try:
+                    info = entrada.stat(follow_symlinks=False)
+                except OSError:
+                    resumo['erros'] += 1
+                    continue
+                if (padroes and not any(fnmatch.fnmatch(entrada.name, p) for p in padroes)) \
+                        or (limite_mtime is not None and info.st_mtime > limite_mtime) \
+                        or (tamanho_minimo is not None and info.st_size < tamanho_minimo):
+                    resumo['ignorados'] += 1
+                    continue
+                yield entrada.path, info.st_size
+
+        def acumula(parcial):
+            removidos, liberados, erros = parcial
+            resumo['arquivos'] += removidos
+            resumo['bytes'] += liberados
+            resumo['erros'] += erros
+
+        lote = []
+        if dry_run or workers <= 1:
+            for item in selecionados():
+                lote.append(item)
+                if len(lote) >= self.TAMANHO_LOTE:
+                    acumula(self._remove_lote(lote, dry_run))
+                    lote = []
+            acumula(self._remove_lote(lote, dry_run))
+        else:
+            from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+            # Mantém no máximo 2 lotes por thread pendentes para a memória não crescer com o diretório
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pendentes = set()
+                for item in selecionados():
+                    lote.append(item)
+                    if len(lote) < self.TAMANHO_LOTE:
+                        continue
+                    pendentes.add(executor.submit(self._remove_lote, lote, False))
+                    lote = []
+                    if len(pendentes) >= workers * 2:
+                        concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                        for futuro in concluidos:
+                            acumula(futuro.result())
+                if lote:
+                    pendentes.add(executor.submit(self._remove_lote, lote, False))
+                for futuro in pendentes:
+                    acumula(futuro.result())
+
+        resumo['segundos'] = round(time.perf_counter() - inicio, 3)
+        if resumo['arquivos'] == 0 and resumo['ignorados'] == 0 and resumo['erros'] == 0:
+            print(f'Pasta de logs vazia: {diretorio}')
+        else:
+            acao = 'seriam removidos' if dry_run else 'removidos'
+            print(f"{diretorio}: {resumo['arquivos']} arquivos {acao} ({resumo['bytes']} bytes), "
+                  f"{resumo['ignorados']} ignorados, {resumo['erros']} erros em {resumo['segundos']}s")
+        return resumo
+
+    @staticmethod
+    def _percorre(diretorio, recursivo):
+        # Gera as entradas de arquivo (inclusive links simbólicos) sem seguir links para pastas
+        pilha = [diretorio]
+        while pilha:
+            atual = pilha.pop()
+            try:
+                with os.scandir(atual) as entradas:
+                    for entrada in entradas:
+                        try:
+                            e_pasta = entrada.is_dir(follow_symlinks=False)
+                        except OSError:
+                            e_pasta = False
+                        if e_pasta:
+                            if recursivo:
+                                pilha.append(entrada.path)
+                        else:
+                            yield entrada
+            except OSError as e:
+                print(f"The error '{e}' occurred")
+
+    @staticmethod
+    def _remove_lote(lote, dry_run):
+        # Remove um lote de (caminho, tamanho) e retorna (removidos, bytes liberados, erros)
+        if dry_run:
+            return len(lote), sum(tamanho for _, tamanho in lote), 0
+        removidos = liberados = erros = 0
+        for caminho, tamanho in lote:
+            try:
+                os.remove(caminho)
+                removidos += 1
+                liberados += tamanho
+            except FileNotFoundError:
+                pass
+            except OSError:
+                erros += 1
+        return removidos, liberados, erros
+
+
+#classe para aplicar políticas de retenção em pastas de resultados e logs
+
+class RetencaoPastas:
+    # Mantém os últimos N arquivos e/ou os dos últimos N dias de cada pasta, compacta os mais antigos
+    # em segundo plano (formato 'zip': um .zip por mês; 'gzip': um .gz por arquivo) dentro da
+    # subpasta PASTA_ARQUIVO e limita o tamanho total de uma árvore de pastas com aplica_cota
+    PASTA_ARQUIVO = 'arquivados'
+    NOME_INDICE = '.retencao_indice.json'
+
+    def __init__(self, formato='zip', workers=1):
+        if formato not in ('zip', 'gzip'):
+            raise ValueError("formato deve ser 'zip' ou 'gzip'")
+        self.formato = formato
+        self.falhas = []
+        self._fila = queue.Queue()
+        self._pendentes = 0
+        self._condicao = threading.Condition()
+        self._locks_destino = {}
+        self._lock_destinos = threading.Lock()
+        self._fechada = False
+        self._workers = [
+            threading.Thread(target=self._trabalhar, name=f'RetencaoPastas-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def aplica(self, pasta, manter_ultimos=None, manter_dias=None, padrao=None, compactar=True):
+        # Seleciona os arquivos expirados da pasta (não recursivo) e os envia para compactação em
+        # segundo plano, ou os remove se compactar=False. Um arquivo é mantido se estiver entre os
+        # manter_ultimos mais recentes ou tiver sido modificado há menos de manter_dias dias.
+        # Retorna {'mantidos', 'expirados'} sem esperar a compactação (use aguardar)
+        if self._fechada:
+            raise RuntimeError('Retenção já foi fechada.')
+        resumo = {'mantidos': 0, 'expirados': 0}
+        if not os.path.isdir(pasta):
+            print(f'Pasta não encontrada: {pasta}')
+            return resumo
+        padroes = [padrao] if isinstance(padrao, str) else list(padrao or [])
+        arquivos = []
+        with os.scandir(pasta) as entradas:
+            for entrada in entradas:
+                if entrada.name == self.NOME_INDICE or not entrada.is_file(follow_symlinks=False):
+                    continue
+                if padroes and not any(fnmatch.fnmatch(entrada.name, p) for p in padroes):
+                    continue
+                try:
+                    arquivos.append((entrada.stat(follow_symlinks=False).st_mtime, entrada.path))
+                except FileNotFoundError:
+                    # Removido por outro processo entre a listagem e o stat
+                    continue
+        arquivos.sort(reverse=True)
+
+        limite_mtime = time.time() - manter_dias * 86400 if manter_dias is not None else None
+        grupos = {}
+        for posicao, (mtime, caminho) in enumerate(arquivos):
+            if (manter_ultimos is None and limite_mtime is None) \
+                    or (manter_ultimos is not None and posicao < manter_ultimos) \
+                    or (limite_mtime is not None and mtime >= limite_mtime):
+                resumo['mantidos'] += 1
+                continue
+            resumo['expirados'] += 1
+            if not compactar:
+                try:
+                    os.remove(caminho)
+                except FileNotFoundError:
+                    pass
+                continue
+            grupos.setdefault(self._destino(pasta, caminho, mtime), []).append(caminho)
+
+        # Um trabalho por arquivo compactado de destino, para cada .zip ser aberto uma única vez
+        for destino, caminhos in grupos.items():
+            with self._condicao:
+                self._pendentes += 1
+            self._fila.put((destino, caminhos))
+        return resumo
+
+    def aplica_cota(self, raiz, cota_bytes):
+        # Garante que a árvore em raiz ocupe no máximo cota_bytes, removendo os arquivos mais antigos
+        # (inclusive os já compactados). Usa um índice incremental salvo em raiz/NOME_INDICE: só são
+        # listadas de novo as pastas cuja data de modificação mudou desde a última execução; nas demais
+        # só os arquivos já indexados são consultados, pois crescer não muda a data da pasta.
+        # Retorna {'bytes_total', 'bytes_liberados', 'removidos', 'pastas_reescaneadas'}
+        self.aguardar()
+        caminho_indice = os.path.join(raiz, self.NOME_INDICE)
+        indice = self._carrega_indice(caminho_indice)
+        resumo = {'bytes_total': 0, 'bytes_liberados': 0, 'removidos': 0, 'pastas_reescaneadas': 0}
+        novo_indice = {}
+        pilha = [raiz]
+        while pilha:
+            pasta = pilha.pop()
+            try:
+                mtime_pasta = os.stat(pasta).st_mtime_ns
+            except OSError:
+                continue
+            registro = indice.get(pasta)
+            if registro is None or registro['mtime'] != mtime_pasta:
+                registro = self._escaneia(pasta, mtime_pasta)
+                resumo['pastas_reescaneadas'] += 1
+            else:
+                self._atualiza_arquivos(pasta, registro)
+            novo_indice[pasta] = registro
+            pilha.extend(os.path.join(pasta, nome) for nome in registro['subpastas'])
+
+        total = sum(tamanho for registro in novo_indice.values() for tamanho, _ in registro['arquivos'].values())
+        if total > cota_bytes:
+            candidatos = sorted(
+                (mtime, pasta, nome, tamanho)
+                for pasta, registro in novo_indice.items()
+                for nome, (tamanho, mtime) in registro['arquivos'].items()
+            )
+            alteradas = set()
+            for mtime, pasta, nome, tamanho in candidatos:
+                if total <= cota_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(pasta, nome))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"The error '{e}' occurred")
+                    continue
+                del novo_indice[pasta]['arquivos'][nome]
+                total -= tamanho
+                resumo['bytes_liberados'] += tamanho
+                resumo['removidos'] += 1
+                alteradas.add(pasta)
+            # As remoções mudam a data das pastas: atualiza para não reescaneá-las na próxima execução
+            for pasta in alteradas:
+                novo_indice[pasta]['mtime'] = os.stat(pasta).st_mtime_ns
+
+        resumo['bytes_total'] = total
+        # Gravar o índice altera a data da raiz, que por isso é sempre reescaneada (uma única pasta)
+        self._salva_indice(caminho_indice, novo_indice)
+        return resumo
+
+    def aguardar(self, timeout=None):
+        # Aguarda até que todas as compactações enfileiradas terminem; retorna False se o timeout expirar
+        with self._condicao:
+            return self._condicao.wait_for(lambda: self._pendentes == 0, timeout)
+
+    def close(self, timeout=None):
+        # Aguarda as compactações pendentes e encerra os workers
+        if self._fechada:
+            return True
+        self._fechada = True
+        concluido = self.aguardar(timeout)
+        for _ in self._workers:
+            self._fila.put(None)
+        for worker in self._workers:
+            worker.join(timeout)
+        return concluido
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _destino(self, pasta, caminho, mtime):
+        pasta_arquivo = os.path.join(pasta, self.PASTA_ARQUIVO)
+        if self.formato == 'zip':
+            return os.path.join(pasta_arquivo, time.strftime('%Y-%m', time.localtime(mtime)) + '.zip')
+        return os.path.join(pasta_arquivo, os.path.basename(caminho) + '.gz')
+
+    def _trabalhar(self):
+        while True:
+            trabalho = self._fila.get()
+            if trabalho is None:
+                return
+            destino, caminhos = trabalho
+            try:
+                with self._lock_do(destino):
+                    os.makedirs(os.path.dirname(destino), exist_ok=True)
+                    if self.formato == 'zip':
+                        self._compacta_zip(destino, caminhos)
+                    else:
+                        self._compacta_gzip(destino, caminhos[0])
+            except Exception as e:
+                print(f'Erro ao compactar {destino}: {e}')
+                self.falhas.append((destino, e))
+            finally:
+                with self._condicao:
+                    self._pendentes -= 1
+                    self._condicao.notify_all()
+
+    def _lock_do(self, destino):
+        with self._lock_destinos:
+            return self._locks_destino.setdefault(destino, threading.Lock())
+
+    @staticmethod
+    def _compacta_zip(destino, caminhos):
+        # Acrescenta os arquivos a uma cópia do .zip do mês e a renomeia sobre o original, como no .gz,
+        # para uma queda no meio nunca corromper o arquivo já existente. Arquivos que sumiram desde a
+        # seleção são pulados; só os originais efetivamente gravados são removidos, após a renomeação
+        import shutil
+        import tempfile
+        import zipfile
+
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(destino), suffix='.tmp')
+        os.close(descritor)
+        gravados = []
+        try:
+            existe = os.path.exists(destino)
+            if existe:
+                shutil.copyfile(destino, temporario)
+            with zipfile.ZipFile(temporario, 'a' if existe else 'w', compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+                existentes = set(arquivo_zip.namelist())
+                for caminho in caminhos:
+                    try:
+                        nome = os.path.basename(caminho)
+                        if nome in existentes:
+                            base, extensao = os.path.splitext(nome)
+                            sufixo = int(os.path.getmtime(caminho))
+                            nome = f'{base}_{sufixo}{extensao}'
+                            contador = 1
+                            while nome in existentes:
+                                nome = f'{base}_{sufixo}_{contador}{extensao}'
+                                contador += 1
+                        arquivo_zip.write(caminho, arcname=nome)
+                    except FileNotFoundError:
+                        continue
+                    existentes.add(nome)
+                    gravados.append(caminho)
+            if gravados:
+                os.replace(temporario, destino)
+            else:
+                os.remove(temporario)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        for caminho in gravados:
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _compacta_gzip(destino, caminho):
+        # Compacta em um temporário e renomeia, para nunca deixar um .gz incompleto no destino. Se já
+        # houver um .gz com o mesmo nome (arquivo de mesmo nome expirado antes), acrescenta a data de
+        # modificação ao nome, como no .zip, em vez de sobrescrevê-lo
+        import gzip
+        import shutil
+        import tempfile
+
+        if os.path.exists(destino):
+            base, extensao = os.path.splitext(os.path.basename(caminho))
+            sufixo = int(os.path.getmtime(caminho))
+            destino = os.path.join(os.path.dirname(destino), f'{base}_{sufixo}{extensao}.gz')
+            contador = 1
+            while os.path.exists(destino):
+                destino = os.path.join(os.path.dirname(destino), f'{base}_{sufixo}_{contador}{extensao}.gz')
+                contador += 1
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(destino), suffix='.tmp')
+        try:
+            with open(caminho, 'rb') as origem, os.fdopen(descritor, 'wb') as saida, \
+                    gzip.GzipFile(filename=os.path.basename(caminho), mode='wb', fileobj=saida) as compactado:
+                shutil.copyfileobj(origem, compactado, 1 << 20)
+            shutil.copystat(caminho, temporario)
+            os.replace(temporario, destino)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        os.remove(caminho)
+
+    @staticmethod
+    def _atualiza_arquivos(pasta, registro):
+        # Relê tamanho e data dos arquivos indexados de uma pasta sem listá-la (um arquivo que cresce,
+        # como um log, não altera a data da pasta)
+        arquivos = registro['arquivos']
+        for nome in list(arquivos):
+            try:
+                info = os.stat(os.path.join(pasta, nome), follow_symlinks=False)
+            except FileNotFoundError:
+                del arquivos[nome]
+                continue
+            except OSError as e:
+                print(f"The error '{e}' occurred")
+                continue
+            arquivos[nome] = [info.st_size, info.st_mtime]
+
+    def _escaneia(self, pasta, mtime_pasta):
+        registro = {'mtime': mtime_pasta, 'arquivos': {}, 'subpastas': []}
+        try:
+            with os.scandir(pasta) as entradas:
+                for entrada in entradas:
+                    if entrada.is_dir(follow_symlinks=False):
+                        registro['subpastas'].append(entrada.name)
+                    elif entrada.name != self.NOME_INDICE:
+                        info = entrada.stat(follow_symlinks=False)
+                        registro['arquivos'][entrada.name] = [info.st_size, info.st_mtime]
+        except OSError as e:
+            print(f"The error '{e}' occurred")
+        return registro
+
+    @staticmethod
+    def _carrega_indice(caminho):
+        try:
+            with open(caminho, 'r', encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _salva_indice(caminho, indice):
+        import tempfile
+
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+                json.dump(indice, arquivo)
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+# Exemplo de uso:
+#cria_pastas = CriaPastas()
+#cria_pastas.cria_pastas('resultado', 'logs', 'logs/subpasta/pasta_x')
+
+# Criar as pastas de saída de todas as lojas e datas de uma vez
+#print(ManipulaPastas().cria_pastas_lote(
+#    [f'resultado/{loja}/{data}' for loja in lojas for data in datas], workers=8))
+
+# Limpar a pasta de logs
+#cria_pastas.limpa_logs('logs')
+
+# Remover recursivamente os .log com mais de 7 dias, simulando antes
+#mp = ManipulaPastas()
+#print(mp.limpa_diretorio('logs', recursivo=True, idade_dias=7, padrao='*.log', dry_run=True))
+
+# Retenção: manter 30 arquivos ou 7 dias, compactar o resto e limitar a árvore a 5 GB
+#with RetencaoPastas(formato='zip') as retencao:
+#    retencao.aplica('logs', manter_ultimos=30, manter_dias=7, padrao='*.log')
+#    retencao.aplica('resultado', manter_dias=15)
+#    print(retencao.aplica_cota('.', cota_bytes=5 * 1024 ** 3))
@@ -0,0 +1,5 @@
+# Só biblioteca padrão: importado direto, o que também garante que
+# modules.arquivo.ManipulaPastas seja a classe e não o submódulo homônimo
+from .ManipulaPastas import ManipulaPastas, RetencaoPastas
+
+__all__ = ['ManipulaPastas', 'RetencaoPastas']
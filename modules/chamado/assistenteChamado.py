@@ -0,0 +1,357 @@
+import datetime
+import getpass
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import deque
+
+from ..config import ConfigHandler
+
+# langchain_openai/langchain_core são importados sob demanda, na primeira geração de texto
+
+
+  # """
+  # Author: Yago Faria
+  # Date: 2023-10-03
+  # Description: Essa classe é responsável por gerar 
+  # o texto do chamado que será enviado para o suporte da Zanthus.
+  
+  # input: str
+  # output: str
+  
+  # Dependências:
+  # - langchain
+  # - getpass
+  # - os
+  
+  
+  # """
+
+
+class CacheRespostas:
+  """
+  Cache persistente (SQLite) das respostas do LLM, com TTL e limite de entradas.
+
+  A chave combina modelo, temperatura, max_tokens, prompt do sistema e o texto
+  de entrada normalizado (caixa, acentuação Unicode e espaços). Com
+  normalizar_numeros=True, sequências de dígitos também são ignoradas, de modo
+  que "parado a 72 minutos" e "parado a 75 minutos" compartilham a resposta.
+  Quando o limite é atingido, as entradas acessadas há mais tempo são removidas.
+  """
+
+  _ESPACOS = re.compile(r"\s+")
+  _NUMEROS = re.compile(r"\d+")
+
+  def __init__(self, caminho='cache/chamados.sqlite', ttl=3600, max_entradas=10000, normalizar_numeros=False):
+    self.caminho = caminho
+    self.ttl = ttl
+    self.max_entradas = max_entradas
+    self.normalizar_numeros = normalizar_numeros
+    self.hits = 0
+    self.misses = 0
+    self._lock = threading.Lock()
+    pasta = os.path.dirname(caminho)
+    if pasta:
+      os.makedirs(pasta, exist_ok=True)
+    self._conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+    self._conexao.execute("PRAGMA journal_mode=WAL")
+    self._conexao.execute("PRAGMA synchronous=NORMAL")
+    self._conexao.execute(
+        "CREATE TABLE IF NOT EXISTS respostas ("
+        "chave TEXT PRIMARY KEY, resposta TEXT NOT NULL, criado REAL NOT NULL, acessado REAL NOT NULL)"
+    )
+    self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_respostas_acessado ON respostas (acessado)")
+
+  def normalizar(self, texto):
+    texto = unicodedata.normalize("NFKC", texto).casefold()
+    if self.normalizar_numeros:
+      texto = self._NUMEROS.sub("#", texto)
+    return self._ESPACOS.sub(" ", texto).strip(" .!?")
+
+  def chave(self, model, temperature, max_tokens, prompt_template, input_text):
+    dados = json.dumps([model, temperature, max_tokens, prompt_template, self.normalizar(input_text)])
+    return hashlib.sha256(dados.encode("utf-8")).hexdigest()
+
+  def get(self, chave):
+    agora = time.time()
+    with self._lock:
+      linha = self._conexao.execute(
+          "SELECT resposta FROM respostas WHERE chave = ? AND criado > ?", (chave, agora - self.ttl)
+      ).fetchone()
+      if linha is None:
+        self.misses += 1
+        return None
+      self._conexao.execute("UPDATE respostas SET acessado = ? WHERE chave = ?", (agora, chave))
+      self.hits += 1
+      return linha[0]
+
+  def set(self, chave, resposta):
+    agora = time.time()
+    with self._lock:
+      self._conexao.execute(
+          "INSERT OR REPLACE INTO respostas (chave, resposta, criado, acessado) VALUES (?, ?, ?, ?)",
+          (chave, resposta, agora, agora),
+      )
+      self._conexao.execute(
+          "DELETE FROM respostas WHERE criado <= ? OR chave IN "
+          "(SELECT chave FROM respostas ORDER BY acessado DESC LIMIT -1 OFFSET ?)",
+          (agora - self.ttl, self.max_entradas),
+      )
+
+  def limpar(self):
+    with self._lock:
+      self._conexao.execute("DELETE FROM respostas")
+
+  def stats(self):
+    with self._lock:
+      entradas = self._conexao.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+      consultas = self.hits + self.misses
+      return {
+          "hits": self.hits,
+          "misses": self.misses,
+          "hit_rate": self.hits / consultas if consultas else 0.0,
+          "entradas": entradas,
+      }
+
+  def fechar(self):
+    with self._lock:
+      self._conexao.close()
+
+
+class AssistenteChamado:
+  
+  # Prompt, LLM (com seu pool HTTP), parser e chain compartilhados pelo processo,
+  # por (modelo, temperatura, max_tokens, chave da API)
+  _componentes_compartilhados = {}
+  _componentes_lock = threading.Lock()
+      
+  def _prompt(self):
+    from langchain_core.prompts import ChatPromptTemplate
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "{prompt}"),
+        ("user", "{input}"),
+    ])
+    return prompt  
+  
+  def _llm_model(self):
+    from langchain_openai import ChatOpenAI
+    llm = ChatOpenAI(
+        model=self.model, 
+        temperature=self.temperature,
+        openai_api_key=self.api_key,
+        max_tokens=self.max_tokens
+    )
+    return llm
+  
+  def _componentes(self):
+    # Constrói (uma única vez por configuração de modelo) e retorna os componentes da chain
+    chave = (self.model, self.temperature, self.max_tokens, self.api_key)
+    componentes = AssistenteChamado._componentes_compartilhados.get(chave)
+    if componentes is None:
+      with AssistenteChamado._componentes_lock:
+        componentes = AssistenteChamado._componentes_compartilhados.get(chave)
+        if componentes is None:
+          from langchain_core.output_parsers import StrOutputParser
+          prompt = self._prompt()
+          llm = self._llm_model()
+          parser = StrOutputParser()
+          componentes = {"prompt": prompt, "llm": llm, "parser": parser, "chain": prompt | llm | parser}
+          AssistenteChamado._componentes_compartilhados[chave] = componentes
+    return componentes
+  
+  @property
+  def prompt(self):
+    return self._componentes()["prompt"]
+  
+  @property
+  def llm(self):
+    return self._componentes()["llm"]
+  
+  @property
+  def parser(self):
+    return self._componentes()["parser"]
+  
+  @property
+  def chain(self):
+    return self._componentes()["chain"]
+  
+  
+  def _cache(self):
+    # Cria o cache de respostas se a seção model.cache existir e não estiver desativada
+    config_cache = self.config_cache
+    if not config_cache or not config_cache.get('ativo', True):
+      return None
+    return CacheRespostas(
+        caminho=config_cache.get('caminho', 'cache/chamados.sqlite'),
+        ttl=config_cache.get('ttl', 3600),
+        max_entradas=config_cache.get('max_entradas', 10000),
+        normalizar_numeros=config_cache.get('normalizar_numeros', False)
+    )
+  
+  
+  def __init__(self, config_path = 'config/config.json', assitente="Zanthus"):
+    config_handler = ConfigHandler(config_path)
+    self.config = config_handler.config
+    self.api_key = config_handler.get_data('api_keys.OPENAI_API_KEY', None)
+    self.model = config_handler.get_data('model.model', None)
+    self.temperature = config_handler.get_data('model.temperature', None)
+    self.max_tokens = config_handler.get_data('model.max_tokens', None)
+    self.prompt_template = config_handler.get_data('model.prompt_zanthus' if assitente == "Zanthus" else 'model.prompt_csc', None)
+    self.config_cache = config_handler.get_data('model.cache', None)
+    self.cache = self._cache()
+    # Medições dos envios em streaming: {"ttft", "total", "chunks", "cache"} (segundos)
+    self.metricas_stream = deque(maxlen=1000)
+    
+    
+  def gerar_texto_chamado(self, input_text, usar_cache=True):
+    # usar_cache=False ignora o cache na leitura, mas grava a nova resposta
+    chave, resultado = self._consulta_cache(input_text, usar_cache)
+    if resultado is not None:
+      return resultado
+    resultado = self.chain.invoke({
+        "prompt": self.prompt_template,
+        "input": input_text
+    })
+    if chave is not None:
+      self.cache.set(chave, resultado)
+    return resultado
+
+  async def agerar_texto_chamado(self, input_text, usar_cache=True):
+    # Versão assíncrona de gerar_texto_chamado (chain.ainvoke)
+    chave, resultado = self._consulta_cache(input_text, usar_cache)
+    if resultado is not None:
+      return resultado
+    resultado = await self.chain.ainvoke({
+        "prompt": self.prompt_template,
+        "input": input_text
+    })
+    if chave is not None:
+      self.cache.set(chave, resultado)
+    return resultado
+
+  def gerar_texto_chamado_stream(self, input_text, usar_cache=True):
+    # Gera o texto do chamado em partes, à medida que o modelo responde (chain.stream).
+    # Registra o tempo até o primeiro trecho (ttft) e o tempo total em self.metricas_stream
+    inicio = time.perf_counter()
+    chave, resultado = self._consulta_cache(input_text, usar_cache)
+    if resultado is not None:
+      self._registra_stream(inicio, inicio, 1, True)
+      yield resultado
+      return
+    partes = []
+    primeiro = None
+    for parte in self.chain.stream({"prompt": self.prompt_template, "input": input_text}):
+      if primeiro is None:
+        primeiro = time.perf_counter()
+      partes.append(parte)
+      yield parte
+    self._registra_stream(inicio, primeiro, len(partes), False)
+    if chave is not None:
+      self.cache.set(chave, "".join(partes))
+
+  async def agerar_texto_chamado_stream(self, input_text, usar_cache=True):
+    # Versão assíncrona de gerar_texto_chamado_stream (chain.astream)
+    inicio = time.perf_counter()
+    chave, resultado = self._consulta_cache(input_text, usar_cache)
+    if resultado is not None:
+      self._registra_stream(inicio, inicio, 1, True)
+      yield resultado
+      return
+    partes = []
+    primeiro = None
+    async for parte in self.chain.astream({"prompt": self.prompt_template, "input": input_text}):
+      if primeiro is None:
+        primeiro = time.perf_counter()
+      partes.append(parte)
+      yield parte
+    self._registra_stream(inicio, primeiro, len(partes), False)
+    if chave is not None:
+      self.cache.set(chave, "".join(partes))
+
+  def _consulta_cache(self, input_text, usar_cache):
+    if self.cache is None:
+      return None, None
+    chave = self.cache.chave(self.model, self.temperature, self.max_tokens, self.prompt_template, input_text)
+    return chave, self.cache.get(chave) if usar_cache else None
+
+  def _registra_stream(self, inicio, primeiro, chunks, do_cache):
+    fim = time.perf_counter()
+    self.metricas_stream.append({
+        "ttft": (primeiro or fim) - inicio,
+        "total": fim - inicio,
+        "chunks": chunks,
+        "cache": do_cache
+    })
+
+  def gerar_textos_chamado(self, inputs, max_concurrency=8, usar_cache=True):
+    # Gera vários chamados em paralelo (chain.batch), com no máximo max_concurrency chamadas simultâneas.
+    # O resultado segue a ordem de inputs; itens que falharam trazem a exceção no lugar do texto
+    inputs = list(inputs)
+    resultados, pendentes, chaves = self._consulta_cache_lote(inputs, usar_cache)
+    if pendentes:
+      respostas = self.chain.batch(
+          [{"prompt": self.prompt_template, "input": inputs[i]} for i in pendentes],
+          config={"max_concurrency": max_concurrency},
+          return_exceptions=True
+      )
+      self._guarda_lote(resultados, pendentes, chaves, respostas)
+    return resultados
+
+  async def agerar_textos_chamado(self, inputs, max_concurrency=8, usar_cache=True):
+    # Versão assíncrona de gerar_textos_chamado (chain.abatch)
+    inputs = list(inputs)
+    resultados, pendentes, chaves = self._consulta_cache_lote(inputs, usar_cache)
+    if pendentes:
+      respostas = await self.chain.abatch(
+          [{"prompt": self.prompt_template, "input": inputs[i]} for i in pendentes],
+          config={"max_concurrency": max_concurrency},
+          return_exceptions=True
+      )
+      self._guarda_lote(resultados, pendentes, chaves, respostas)
+    return resultados
+
+  def _consulta_cache_lote(self, inputs, usar_cache):
+    # Separa os itens já presentes no cache dos que precisam ir ao LLM
+    resultados = [None] * len(inputs)
+    chaves = [None] * len(inputs)
+    pendentes = []
+    for i, input_text in enumerate(inputs):
+      if self.cache is not None:
+        chaves[i] = self.cache.chave(self.model, self.temperature, self.max_tokens, self.prompt_template, input_text)
+        if usar_cache:
+          resultados[i] = self.cache.get(chaves[i])
+      if resultados[i] is None:
+        pendentes.append(i)
+    return resultados, pendentes, chaves
+
+  def _guarda_lote(self, resultados, pendentes, chaves, respostas):
+    for i, resposta in zip(pendentes, respostas):
+      resultados[i] = resposta
+      if chaves[i] is not None and not isinstance(resposta, Exception):
+        self.cache.set(chaves[i], resposta)
+    
+
+
+
+
+if __name__ == "__main__":
+    openai = AssistenteChamado(assitente="Zanthus")
+    resultado = openai.gerar_texto_chamado("O serviço mirage não está funcionando corretamente, já tentei reiniciá-lo e não funcionou. O que eu faço?")
+    print(resultado)
+    print("\n\nTexto gerado com sucesso\n\n")
+  
+    
+#     openai = AssistenteChamado(assitente="Zanthus")
+#     minutos = 72
+#     hora_atual = datetime.datetime.now()
+#     hora_atual = hora_atual.strftime("%H:%M:%S")
+#     resultado = openai.gerar_texto_chamado(f" Servço mirage parado a {minutos} minutos, hora atual: {hora_atual}")
+#     print(resultado)
+    
+    
+    
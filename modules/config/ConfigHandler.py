@@ -0,0 +1,549 @@
+# Autor: Yago Assis Mendes Faria
+import atexit
+import copy
+import json
+import os
+import stat
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+'''
+ Esta classe é responsável por manipular um arquivo de configuração JSON.
+    Ela permite carregar, salvar e manipular valores de configuração.
+    Cada arquivo é lido e interpretado uma única vez por processo: todas as
+    instâncias compartilham o mesmo dicionário em memória, que só é relido
+    quando o mtime/tamanho do arquivo muda (verificado via os.stat no máximo
+    a cada INTERVALO_VERIFICACAO segundos). Alterações com set_config_value/
+    delete_config_value ficam em uma cópia própria da instância até o save_config;
+    o atributo config e as seções retornadas por get_data também são cópias.
+    get_data aceita caminhos com pontos ("email.smtp_port"), resolvidos por um
+    índice achatado construído uma vez por versão da configuração, e variáveis
+    de ambiente no formato CONFIG__EMAIL__SMTP_PORT sobrepõem o arquivo.
+    save_config grava de forma atômica (arquivo temporário + fsync + rename),
+    sob um lock de arquivo entre processos, aplicando apenas as alterações da
+    instância sobre o conteúdo atual do disco; com debounce > 0 as gravações
+    são agrupadas em uma só.
+    Atributos:
+        file_path: str
+        config: dict
+        debounce: float (segundos para agrupar chamadas de save_config)
+    Métodos:
+        load_config: dict
+        get_data: dict
+        save_config: None
+        flush: None
+        lote: context manager
+        set_config_value: None
+        delete_config_value: None
+    dependencias:
+        json
+        os
+    
+'''
+_AUSENTE = object()
+
+# Instâncias com gravação adiada pendente, gravadas ao encerrar o processo
+_pendentes = weakref.WeakSet()
+
+
+@atexit.register
+def _grava_pendentes():
+    for handler in list(_pendentes):
+        handler.flush()
+
+
+class ConfigHandler:
+    # Registro do processo: caminho absoluto -> {"assinatura", "config", "verificado", "indice"}
+    _registro = {}
+    _registro_lock = threading.Lock()
+    INTERVALO_VERIFICACAO = 1.0
+    # Prefixo das variáveis de ambiente que sobrepõem a configuração (caminho com "." vira "__")
+    PREFIXO_ENV = "CONFIG__"
+    # Variáveis de ambiente já resolvidas: caminho -> valor (ou _AUSENTE)
+    _env_resolvido = {}
+
+    # region Construtores
+    def __init__(self, file_path, debounce=0):
+        self.file_path = file_path
+        self.debounce = debounce
+        self._alteracoes = []  # [("set", partes, valor) | ("delete", partes, None)] desde o último save
+        self._em_lote = 0
+        self._timer = None
+        self._salvar_lock = threading.RLock()
+        self._privado = False
+        self._entrada = None
+        self._indice = None
+        self._indice_de = None
+        self._exposto = False  # self.config já foi entregue a quem chamou
+        self._base = None      # cópia de self.config no momento da entrega, para detectar edições diretas
+        self._config = None
+        self._recarrega()
+        print(f"Instância de ConfigHandler criada com o arquivo {file_path}")
+    # endregion Construtores
+
+    # region Destrutores
+    def __del__(self):
+        print(f"Instância de ConfigHandler com o arquivo {self.file_path} está sendo destruída.")
+    # endregion Destrutores
+
+    # region Propriedades
+    @property
+    def config(self):
+        # Acesso direto ao dicionário: a instância passa a usar uma cópia própria, para que
+        # alterações feitas nele não vazem para as outras instâncias do mesmo arquivo
+        if not self._exposto:
+            self._torna_privado()
+            self._base = copy.deepcopy(self._config)
+            self._exposto = True
+        return self._config
+
+    @config.setter
+    def config(self, valor):
+        if not self._exposto:
+            self._base = self._config
+        self._config = valor
+        self._privado = True
+        self._exposto = True
+        self._indice = None
+    # endregion Propriedades
+
+    # region Métodos Públicos
+    def load_config(self):
+        # Retorna uma cópia do conteúdo do config.json (utf-8), relendo o arquivo apenas se ele mudou.
+        # Descarta as alterações não salvas da instância
+        self._recarrega()
+        return copy.deepcopy(self._config)
+
+
+    def get_data(self, key, default=_AUSENTE, tipo=None):
+        # Obtém um valor da configuração. key pode ser um caminho com pontos ("email.smtp_port").
+        # Sem default, chaves ausentes retornam {}; com tipo (ou o tipo do default) o valor é convertido,
+        # e valores nulos ou que não podem ser convertidos retornam o default
+        self._sincroniza()
+        padrao = {} if default is _AUSENTE else default
+        if self._config is None:
+            return None if default is _AUSENTE else default
+        try:
+            valor = self._valor_env(key)
+            if valor is _AUSENTE and self._exposto:
+                # self.config pode ter sido alterado diretamente: o índice não enxerga essas mudanças
+                valor = self._busca(self._config, self._partes(key))
+            elif valor is _AUSENTE:
+                valor = self._indice_atual().get(key, _AUSENTE)
+            if valor is _AUSENTE:
+                return padrao
+            if tipo is None and default is not _AUSENTE and default is not None:
+                tipo = type(default)
+            if tipo is not None:
+                if valor is None:
+                    return None if default is _AUSENTE else default
+                try:
+                    return self._converte(valor, tipo)
+                except (TypeError, ValueError) as e:
+                    print(f"Valor de {key} não pôde ser convertido para {tipo.__name__}: {e}")
+                    return None if default is _AUSENTE else default
+            # Seções e listas saem como cópia: o dicionário interno é compartilhado pelo processo
+            return copy.deepcopy(valor) if isinstance(valor, (dict, list)) else valor
+        except Exception as e:
+            error_msg = f"Error getting user credentials for key {key}: {e}"
+            print(error_msg)
+            return None
+
+    def save_config(self, forcar=False):
+        # Salva as alterações da instância no arquivo. Sem alterações pendentes nada é gravado;
+        # forcar=True grava self.config inteiro. Com debounce > 0 ou dentro de lote() a gravação é adiada.
+        # Edições feitas diretamente em self.config também contam como alterações
+        self._registra_edicoes_diretas()
+        if not forcar and not self._alteracoes:
+            return None
+        if not forcar and self._em_lote:
+            return None
+        if not forcar and self.debounce > 0:
+            self._agenda_gravacao()
+            return None
+        return self._grava(forcar)
+
+    def flush(self):
+        # Grava imediatamente uma gravação adiada pendente
+        self._registra_edicoes_diretas()
+        if self._alteracoes:
+            return self._grava()
+        return None
+
+    @contextmanager
+    def lote(self):
+        # Agrupa várias alterações e save_config em uma única gravação ao fim do bloco
+        self._em_lote += 1
+        try:
+            yield self
+        finally:
+            self._em_lote -= 1
+            if not self._em_lote:
+                self.save_config()
+
+    def set_config_value(self, key, value):
+        # Define um valor na configuração (key pode ser um caminho com pontos)
+        with self._salvar_lock:
+            partes = self._partes(key)
+            if self._config is not None:
+                atual = self._busca(self._config, partes)
+                # Mesmo critério de _diferencas: True sobre 1 ou 1.0 sobre 1 é uma alteração
+                if type(atual) is type(value) and atual == value:
+                    return
+            self._torna_privado()
+            if self._config is None:
+                self._config = {}
+            self._aplica_set(self._config, partes, value)
+            self._alteracoes.append(("set", partes, copy.deepcopy(value)))
+            self._indice = None
+
+    def delete_config_value(self, key):
+        # Exclui um valor da configuração (key pode ser um caminho com pontos)
+        with self._salvar_lock:
+            if not self._config:
+                return
+            partes = self._partes(key)
+            if self._busca(self._config, partes) is _AUSENTE:
+                return
+            self._torna_privado()
+            self._aplica_delete(self._config, partes)
+            self._alteracoes.append(("delete", partes, None))
+            self._indice = None
+
+    @classmethod
+    def limpar_cache_env(cls):
+        # Descarta as variáveis de ambiente já resolvidas (após alterar os.environ)
+        cls._env_resolvido.clear()
+    # endregion Métodos Públicos
+
+    # region Métodos Privados
+    def _recarrega(self):
+        # Passa a usar a versão do registro (verificando o arquivo na hora), sem alterações próprias:
+        # descarta as alterações pendentes e cancela uma gravação adiada
+        entrada = self._carrega_compartilhado(self.file_path, forcar=True)
+        with self._salvar_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            _pendentes.discard(self)
+            self._alteracoes = []
+            self._privado = False
+            self._exposto = False
+            self._base = None
+            self._indice = None
+            self._entrada = entrada
+            self._config = entrada["config"] if entrada else None
+
+    @classmethod
+    def _carrega_compartilhado(cls, file_path, forcar=False):
+        # Retorna a entrada do registro para o arquivo, relendo-o só se mtime/tamanho mudaram.
+        # Sem forcar, o os.stat é feito no máximo a cada INTERVALO_VERIFICACAO segundos
+        caminho = os.path.abspath(file_path)
+        agora = time.monotonic()
+        with cls._registro_lock:
+            entrada = cls._registro.get(caminho)
+            if entrada is not None and not forcar and agora - entrada["verificado"] < cls.INTERVALO_VERIFICACAO:
+                return entrada
+            try:
+                estado = os.stat(caminho)
+                assinatura = (estado.st_mtime_ns, estado.st_size)
+                if entrada is not None and entrada["assinatura"] == assinatura:
+                    entrada["verificado"] = agora
+                    return entrada
+                with open(caminho, 'r', encoding="UTF-8") as file:
+                    config = json.load(file)
+            except FileNotFoundError:
+                error_msg = f"Config file {file_path} not found."
+                print(error_msg)
+                cls._registro.pop(caminho, None)
+                return None
+            except json.JSONDecodeError:
+                error_msg = f"Error decoding JSON from the config file {file_path}."
+                print(error_msg)
+                cls._registro.pop(caminho, None)
+                return None
+            entrada = {"assinatura": assinatura, "config": config, "verificado": agora}
+            cls._registro[caminho] = entrada
+            return entrada
+
+    def _grava(self, forcar=False):
+        # Relê o arquivo sob lock, aplica as alterações pendentes e grava de forma atômica
+        with self._salvar_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            _pendentes.discard(self)
+            alteracoes = self._alteracoes
+            if not forcar and not alteracoes:
+                return None
+            try:
+                with self._trava_arquivo():
+                    novo = None if forcar else self._le_disco()
+                    if novo is None:
+                        # Cópia: o dicionário publicado no registro não pode ser o que foi entregue em self.config
+                        novo = copy.deepcopy(self._config)
+                    else:
+                        for operacao, partes, valor in alteracoes:
+                            if operacao == "set":
+                                self._aplica_set(novo, partes, copy.deepcopy(valor))
+                            else:
+                                self._aplica_delete(novo, partes)
+                    self._escreve_atomico(novo)
+                self._config = novo
+                self._alteracoes = []
+                self._indice = None
+                self._publica()
+            except Exception as e:
+                error_msg = f"Error saving config to file {self.file_path}: {e}"
+                print(error_msg)
+                return None
+
+    def _agenda_gravacao(self):
+        # Reinicia a contagem do debounce: a gravação ocorre após `debounce` segundos sem novos save_config
+        with self._salvar_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+            _pendentes.add(self)
+
+    def _le_disco(self):
+        # Conteúdo atual do arquivo (pode ter sido alterado por outro processo), ou None
+        try:
+            with open(self.file_path, 'r', encoding="UTF-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _escreve_atomico(self, config):
+        # Grava em um temporário no mesmo diretório, faz fsync e substitui o arquivo com os.replace
+        import tempfile  # só é necessário ao gravar; fora do import do módulo para acelerar a inicialização
+
+        pasta = os.path.dirname(os.path.abspath(self.file_path))
+        descritor, temporario = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=pasta)
+        try:
+            with os.fdopen(descritor, 'w', encoding="UTF-8") as file:
+                json.dump(config, file, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(self.file_path):
+                # mkstemp cria o temporário com permissão 0600: mantém a do arquivo original
+                os.chmod(temporario, stat.S_IMODE(os.stat(self.file_path).st_mode))
+            os.replace(temporario, self.file_path)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        if fcntl is not None:
+            descritor_pasta = os.open(pasta, os.O_RDONLY)
+            try:
+                os.fsync(descritor_pasta)
+            finally:
+                os.close(descritor_pasta)
+
+    @contextmanager
+    def _trava_arquivo(self):
+        # Lock exclusivo entre processos em "<arquivo>.lock"
+        with open(self.file_path + ".lock", 'a+b') as trava:
+            if fcntl is not None:
+                fcntl.flock(trava.fileno(), fcntl.LOCK_EX)
+            else:
+                trava.seek(0)
+                msvcrt.locking(trava.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(trava.fileno(), fcntl.LOCK_UN)
+                else:
+                    trava.seek(0)
+                    msvcrt.locking(trava.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _registra_edicoes_diretas(self):
+        # Converte as diferenças entre self.config e a cópia guardada na entrega em alterações pendentes
+        with self._salvar_lock:
+            if not self._exposto:
+                return
+            alteracoes = self._diferencas(self._base or {}, self._config or {})
+            if alteracoes:
+                self._alteracoes.extend(alteracoes)
+                self._base = copy.deepcopy(self._config)
+
+    @staticmethod
+    def _diferencas(antigo, novo, prefixo=()):
+        # Alterações ("set"/"delete", partes, valor) que levam o dicionário antigo ao novo
+        alteracoes = []
+        for chave, valor in novo.items():
+            partes = [*prefixo, chave]
+            if chave not in antigo:
+                alteracoes.append(("set", partes, copy.deepcopy(valor)))
+            elif isinstance(valor, dict) and isinstance(antigo[chave], dict):
+                alteracoes.extend(ConfigHandler._diferencas(antigo[chave], valor, partes))
+            elif antigo[chave] != valor or type(antigo[chave]) is not type(valor):
+                alteracoes.append(("set", partes, copy.deepcopy(valor)))
+        for chave in antigo:
+            if chave not in novo:
+                alteracoes.append(("delete", [*prefixo, chave], None))
+        return alteracoes
+
+    @staticmethod
+    def _busca(config, partes):
+        alvo = config
+        for parte in partes:
+            if not isinstance(alvo, dict) or parte not in alvo:
+                return _AUSENTE
+            alvo = alvo[parte]
+        return alvo
+
+    @staticmethod
+    def _aplica_set(config, partes, valor):
+        *pais, chave = partes
+        alvo = config
+        for parte in pais:
+            if not isinstance(alvo.get(parte), dict):
+                alvo[parte] = {}
+            alvo = alvo[parte]
+        alvo[chave] = valor
+
+    @staticmethod
+    def _aplica_delete(config, partes):
+        *pais, chave = partes
+        alvo = config
+        for parte in pais:
+            alvo = alvo.get(parte)
+            if not isinstance(alvo, dict):
+                return
+        alvo.pop(chave, None)
+
+    def _sincroniza(self):
+        # Passa a usar a versão mais recente do registro, se a instância não tiver alterações próprias
+        if self._privado:
+            return
+        entrada = self._carrega_compartilhado(self.file_path)
+        if entrada is not None:
+            self._entrada = entrada
+            self._config = entrada["config"]
+
+    def _indice_atual(self):
+        # Índice {caminho.com.pontos: valor} da configuração atual, construído uma vez por versão.
+        # Sem alterações próprias, o índice fica no registro e é compartilhado entre as instâncias
+        entrada = self._entrada
+        if not self._privado and entrada is not None and entrada["config"] is self._config:
+            indice = entrada.get("indice")
+            if indice is None:
+                indice = entrada["indice"] = self._achata(self._config)
+            return indice
+        if self._indice is None or self._indice_de is not self._config:
+            self._indice = self._achata(self._config)
+            self._indice_de = self._config
+        return self._indice
+
+    @staticmethod
+    def _achata(config, prefixo="", indice=None):
+        indice = {} if indice is None else indice
+        for chave, valor in config.items():
+            caminho = prefixo + str(chave)
+            indice[caminho] = valor
+            if isinstance(valor, dict):
+                ConfigHandler._achata(valor, caminho + ".", indice)
+        return indice
+
+    def _partes(self, key):
+        # Uma chave de primeiro nível com "." no nome é tratada como chave, não como caminho
+        if self._config is not None and key in self._config:
+            return [key]
+        return key.split(".")
+
+    @classmethod
+    def _valor_env(cls, key):
+        # Valor da variável de ambiente que sobrepõe key (memorizado por processo)
+        valor = cls._env_resolvido.get(key, None)
+        if key not in cls._env_resolvido:
+            nome = cls.PREFIXO_ENV + key.replace(".", "__").upper()
+            bruto = os.environ.get(nome)
+            if bruto is None:
+                valor = _AUSENTE
+            else:
+                try:
+                    valor = json.loads(bruto)
+                except ValueError:
+                    valor = bruto
+            cls._env_resolvido[key] = valor
+        return valor
+
+    @staticmethod
+    def _converte(valor, tipo):
+        if isinstance(valor, tipo):
+            return valor
+        if tipo is bool and isinstance(valor, str):
+            return valor.strip().lower() in ("1", "true", "sim", "yes", "on")
+        return tipo(valor)
+
+    def _torna_privado(self):
+        # Copia a configuração compartilhada antes da primeira alteração da instância
+        if not self._privado:
+            self._config = copy.deepcopy(self._config)
+            self._privado = True
+
+    def _publica(self):
+        # Após salvar, a configuração da instância passa a ser a versão compartilhada do arquivo
+        caminho = os.path.abspath(self.file_path)
+        estado = os.stat(caminho)
+        with ConfigHandler._registro_lock:
+            ConfigHandler._registro[caminho] = {
+                "assinatura": (estado.st_mtime_ns, estado.st_size),
+                "config": self._config,
+                "verificado": time.monotonic(),
+            }
+            self._entrada = ConfigHandler._registro[caminho]
+        self._privado = False
+        self._exposto = False
+    # endregion Métodos Privados
+
+# Exemplo de uso
+'''
+# Criando uma instância de ConfigHandler com o caminho do arquivo JSON
+config_handler = ConfigHandler('config.json')
+
+# Exemplo de obtenção de informações da API 'criar_chamados_csc'
+api_info = config_handler.get_api_info('criar_chamados_csc')
+if api_info:
+    print("API Info:", api_info)
+else:
+    print("API 'criar_chamados_csc' não encontrada ou configuração não carregada.")
+
+# Exemplo de obtenção de informações da URL 'url_gobots'
+url_info = config_handler.get_url_info('url_gobots')
+if url_info:
+    print("URL Info:", url_info)
+else:
+    print("URL 'url_gobots' não encontrada ou configuração não carregada.")
+
+# Exemplo de obtenção de credenciais do usuário 'gobots_user'
+user_credentials = config_handler.get_user_credentials('gobots_user')
+if user_credentials:
+    print("User Credentials:", user_credentials)
+else:
+    print("Credenciais 'gobots_user' não encontradas ou configuração não carregada.")
+
+# Exemplo de definição de um novo valor na configuração
+config_handler.set_config_value('new_key', 'new_value')
+# edita o valor de uma chave
+config_handler.set_config_value('new_key', 'new_value2')
+
+# Salva a configuração de volta no arquivo
+config_handler.save_config()
+
+# Exemplo de exclusão de um valor na configuração
+config_handler.delete_config_value('new_key')
+config_handler.save_config()
+'''
@@ -0,0 +1,5 @@
+# Só biblioteca padrão: importado direto, o que também garante que
+# modules.config.ConfigHandler seja a classe e não o submódulo homônimo
+from .ConfigHandler import ConfigHandler
+
+__all__ = ['ConfigHandler']
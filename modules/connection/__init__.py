@@ -0,0 +1,12 @@
+from .._lazy import exporta_sob_demanda
+
+# Connection (mysql-connector) e AsyncConnection (aiomysql) ficam em submódulos
+# separados: usar um não importa o driver do outro
+__getattr__, __dir__, __all__ = exporta_sob_demanda(globals(), {
+    'Connection': '.connection',
+    'ConnectionPool': '.connection',
+    'QueryCache': '.connection',
+    'StatementMetrics': '.connection',
+    'PartialWriteError': '.connection',
+    'AsyncConnection': '.async_connection',
+})
@@ -0,0 +1,176 @@
+# Autor: Yago Assis Mendes Faria
+import asyncio
+import weakref
+
+import aiomysql
+from aiomysql import Error
+
+'''
+ Modulo de conexão assíncrona com o banco de dados MySQL
+
+    Mesma interface de Connection, mas com métodos async e suporte a
+    "async with", permitindo sobrepor a latência de várias consultas
+    independentes com asyncio.gather. As conexões vêm de um pool aiomysql
+    compartilhado por (event loop, host, database, user); os pools de um loop
+    são esquecidos quando o loop é fechado ou coletado.
+    Atributos:
+        host: str
+        database: str
+        user: str
+        password: str
+        pool: aiomysql.Pool
+        connection: aiomysql.Connection
+        cursor: aiomysql.Cursor
+    Métodos:
+        connect: bool
+        execute_query: bool
+        execute_read_query: list
+        disconnect: bool
+        close_all_pools: None
+        __aenter__: AsyncConnection
+        __aexit__: None
+    dependencias:
+        aiomysql
+
+'''
+class AsyncConnection:
+    # event loop -> {(host, database, user): pool}; chaves fracas para não prender loops encerrados
+    _pools = weakref.WeakKeyDictionary()
+    _pools_locks = weakref.WeakKeyDictionary()
+
+    def __init__(self, host, database, user, password, min_size=1, max_size=10, pool_recycle=300):
+        self.connection = None
+        self.cursor = None
+        self.pool = None
+        self.host = host
+        self.database = database
+        self.user = user
+        self.password = password
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool_recycle = pool_recycle
+
+    async def _get_pool(self):
+        # Retorna o pool do event loop atual para (host, database, user), criando-o se necessário
+        cls = type(self)
+        loop = asyncio.get_running_loop()
+        cls._esquece_loops_fechados()
+        lock = cls._pools_locks.get(loop)
+        if lock is None:
+            lock = cls._pools_locks[loop] = asyncio.Lock()
+        pools = cls._pools.setdefault(loop, {})
+        chave = (self.host, self.database, self.user)
+        async with lock:
+            pool = pools.get(chave)
+            if pool is None or pool.closed:
+                pool = await aiomysql.create_pool(
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    db=self.database,
+                    minsize=self.min_size,
+                    maxsize=self.max_size,
+                    pool_recycle=self.pool_recycle,
+                )
+                pools[chave] = pool
+        return pool
+
+    @classmethod
+    def _esquece_loops_fechados(cls):
+        # Descarta os pools de loops já fechados: as conexões deles não podem mais ser usadas
+        for loop in [loop for loop in list(cls._pools.keys()) if loop.is_closed()]:
+            cls._pools.pop(loop, None)
+            cls._pools_locks.pop(loop, None)
+
+    @classmethod
+    async def close_all_pools(cls):
+        # Fecha os pools assíncronos do event loop atual (os de loops fechados são só descartados)
+        cls._esquece_loops_fechados()
+        loop = asyncio.get_running_loop()
+        pools = list(cls._pools.pop(loop, {}).values())
+        cls._pools_locks.pop(loop, None)
+        for pool in pools:
+            pool.close()
+            await pool.wait_closed()
+
+    async def connect(self):
+        # Empresta uma conexão do pool assíncrono
+        try:
+            self.pool = await self._get_pool()
+            self.connection = await self.pool.acquire()
+            self.cursor = await self.connection.cursor()
+            print("Connected to MySQL database (async)")
+            return True
+        except Error as e:
+            print(f"The error '{e}' occurred")
+            return False
+
+    async def execute_query(self, query, params=None):
+        # Executa uma query no banco de dados
+        try:
+            await self.cursor.execute(query, params)
+            await self.connection.commit()
+            print("Query executed successfully")
+            return True
+        except Error as e:
+            print(f"The error '{e}' occurred")
+            return False
+
+    async def execute_read_query(self, query, params=None):
+        # Executa uma query de leitura no banco de dados
+        result = None
+        try:
+            await self.cursor.execute(query, params)
+            result = await self.cursor.fetchall()
+            return result
+        except Error as e:
+            print(f"The error '{e}' occurred")
+            return result
+
+    async def disconnect(self):
+        # Devolve a conexão ao pool
+        if self.connection is not None:
+            try:
+                await self.cursor.close()
+                if self.connection.get_transaction_status():
+                    await self.connection.rollback()
+            except Error:
+                pass
+            self.pool.release(self.connection)
+            self.connection = None
+            self.cursor = None
+            print("Connection returned to pool")
+            return True
+        else:
+            print("No connection to close")
+            return False
+
+    async def __aenter__(self):
+        # Entra no contexto da classe
+        if await self.connect():
+            return self
+        else:
+            raise Exception("Failed to connect to the database")
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Sai do contexto da classe
+        await self.disconnect()
+
+
+'''
+# Exemplo de uso: consultas independentes em paralelo
+import asyncio
+from modules.connection import AsyncConnection
+
+async def busca(query, params):
+    async with AsyncConnection("localhost", "meu_banco", "meu_usuario", "minha_senha") as conn:
+        return await conn.execute_read_query(query, params)
+
+async def main():
+    lojas, parametros = await asyncio.gather(
+        busca("SELECT * FROM lojas WHERE ativa = %s", (1,)),
+        busca("SELECT * FROM parametros WHERE robo = %s", ("cte",)),
+    )
+
+asyncio.run(main())
+'''
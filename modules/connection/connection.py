@@ -0,0 +1,985 @@
+# Autor: Yago Assis Mendes Faria
+import re
+import sys
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+'''
+ Modulo de conexão com o banco de dados MySQL
+
+    Atributos:
+        host: str
+        database: str
+        user: str
+        password: str
+        connection: mysql.connector.connection.MySQLConnection
+        cursor: mysql.connector.cursor.MySQLCursor
+    Métodos:
+        connect: bool
+        execute_query: bool
+        transaction: context manager
+        execute_many: dict
+        bulk_insert: dict
+        execute_read_query: list
+        iter_read_query: generator
+        disconnect: bool
+        __enter__: Connection
+        __exit__: None
+    dependencias:
+        mysql.connector
+        mysql.connector.Error
+    
+'''
+
+_NOVA_CONEXAO = object()
+
+# Cursores preparados por conexão física (sobrevivem às devoluções ao pool)
+_statement_caches = weakref.WeakKeyDictionary()
+
+
+def _bytes_linha(linha):
+    # Estimativa (por cima) dos bytes de uma linha no texto do INSERT: o repr já traz as aspas e
+    # dobra as barras invertidas; soma os bytes UTF-8 e o escape das aspas simples
+    texto = repr(linha)
+    tamanho = len(texto) if texto.isascii() else len(texto.encode())
+    return tamanho + texto.count("'")
+
+
+# Leitura das tabelas de uma instrução SQL para o QueryCache. Na dúvida a análise devolve None:
+# leituras não são guardadas e escritas invalidam todo o banco
+_NOME_TABELA = r"(?:`[^`]+`|\w+)(?:\s*\.\s*(?:`[^`]+`|\w+))?"
+_FIM_LISTA = (r"where|from|join|inner|left|right|cross|natural|straight_join|outer|on|using|group|order"
+              r"|limit|having|union|window|for|lock|into|set|except|intersect|procedure|values|select")
+_LITERAIS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"|/\*.*?\*/|--[^\n]*|#[^\n]*", re.DOTALL)
+_INICIO_LISTA = re.compile(r"\b(?:from|join|straight_join)\b", re.IGNORECASE)
+_REFERENCIA = re.compile(
+    rf"\s*({_NOME_TABELA})(?:\s+as\s+(?:`[^`]+`|\w+)|\s+(?!(?:{_FIM_LISTA})\b)(?:`[^`]+`|\w+))?\s*",
+    re.IGNORECASE,
+)
+_FIM_REFERENCIAS = re.compile(rf"(?:\)|;|$|(?:{_FIM_LISTA})\b)", re.IGNORECASE)
+_MODIFICA = re.compile(r"\b(?:insert|replace|update|delete)\b", re.IGNORECASE)
+_INSERCAO = re.compile(
+    rf"^\s*(?:insert|replace)(?:\s+(?:low_priority|delayed|high_priority|ignore))*\s+(?:into\s+)?({_NOME_TABELA})",
+    re.IGNORECASE,
+)
+_ALTERACAO = re.compile(r"^\s*(?:update|delete)(?:\s+(?:low_priority|quick|ignore))*\s+", re.IGNORECASE)
+_TABELA_DDL = re.compile(
+    rf"^\s*(?:truncate(?:\s+table)?|alter(?:\s+(?:online|ignore))*\s+table"
+    rf"|create(?:\s+temporary)?\s+table(?:\s+if\s+not\s+exists)?)\s+({_NOME_TABELA})",
+    re.IGNORECASE,
+)
+_DROP = re.compile(r"^\s*drop(?:\s+temporary)?\s+table(?:\s+if\s+exists)?\s+", re.IGNORECASE)
+_RENOMEIA = re.compile(rf"({_NOME_TABELA})\s+to\s+({_NOME_TABELA})", re.IGNORECASE)
+_ESCRITA = re.compile(r"^\s*(?:insert|replace|update|delete|truncate|drop|alter|rename|create|load|call)\b",
+                      re.IGNORECASE)
+
+
+def _nome_tabela(nome):
+    # Normaliza "banco.`Tabela`" para "tabela"
+    return re.split(r"\s*\.\s*", nome)[-1].strip("`").lower()
+
+
+def _lista_tabelas(sql, posicao, tabelas):
+    # Lê a lista "t1 [AS] a, banco.t2 b, ..." a partir de posicao, acrescentando os nomes em tabelas.
+    # Retorna False se algo ali não for uma referência simples (subconsulta, índice, partição...)
+    while True:
+        referencia = _REFERENCIA.match(sql, posicao)
+        if referencia is None:
+            return False
+        tabelas.add(_nome_tabela(referencia.group(1)))
+        posicao = referencia.end()
+        if sql.startswith(",", posicao):
+            posicao += 1
+            continue
+        return _FIM_REFERENCIAS.match(sql, posicao) is not None
+
+
+def _todas_as_listas(sql, tabelas):
+    # Lê as listas de tabelas após cada FROM/JOIN da instrução (inclusive de subconsultas)
+    return all(_lista_tabelas(sql, inicio.end(), tabelas) for inicio in _INICIO_LISTA.finditer(sql))
+
+
+@lru_cache(maxsize=1024)
+def _tabelas_lidas(sql):
+    # Tabelas lidas por um SELECT/WITH, ou None se a instrução não puder ser analisada com segurança
+    sql = _LITERAIS.sub("?", sql)
+    tabelas = set()
+    if sql.lstrip(" (").lower().startswith("with") and _MODIFICA.search(sql):
+        return None
+    return frozenset(tabelas) if _todas_as_listas(sql, tabelas) else None
+
+
+@lru_cache(maxsize=1024)
+def _tabelas_escritas(sql):
+    # Tabelas alteradas por uma instrução: vazio se ela não escreve, None se escreve mas não pôde ser
+    # analisada (CALL, LOAD DATA, listas com subconsultas...)
+    sql = _LITERAIS.sub("?", sql)
+    if not _ESCRITA.match(sql):
+        return None if sql.lstrip(" (").lower().startswith("with") and _MODIFICA.search(sql) else frozenset()
+    insercao = _INSERCAO.match(sql) or _TABELA_DDL.match(sql)
+    if insercao:
+        return frozenset([_nome_tabela(insercao.group(1))])
+    tabelas = set()
+    alteracao = _ALTERACAO.match(sql)
+    if alteracao:
+        # UPDATE a JOIN b / DELETE a, b FROM a JOIN b / DELETE FROM a USING a, b: todas as tabelas
+        # citadas contam como escritas (invalidar a mais é seguro)
+        if not sql[alteracao.end():].lower().startswith("from") and not _lista_tabelas(sql, alteracao.end(), tabelas):
+            return None
+        for using in re.finditer(r"\busing\s+(?!\()", sql, re.IGNORECASE):
+            if not _lista_tabelas(sql, using.end(), tabelas):
+                return None
+        return frozenset(tabelas) if _todas_as_listas(sql, tabelas) else None
+    drop = _DROP.match(sql)
+    if drop:
+        return frozenset(tabelas) if _lista_tabelas(sql, drop.end(), tabelas) else None
+    if sql.lstrip().lower().startswith("rename"):
+        pares = _RENOMEIA.findall(sql)
+        return frozenset(_nome_tabela(nome) for par in pares for nome in par) or None
+    return None
+
+
+def _estima_bytes(linhas):
+    # Estimativa do tamanho em memória de uma lista de linhas
+    tamanho = sys.getsizeof(linhas)
+    for linha in linhas:
+        tamanho += sys.getsizeof(linha) + sum(sys.getsizeof(valor) for valor in linha)
+    return tamanho
+
+
+'''
+ Pool de conexões MySQL compartilhado pelo processo
+
+    Cada pool é identificado por (host, database, user) e é obtido via
+    ConnectionPool.get_pool(). Conexões devolvidas têm a sessão reiniciada
+    (como no mysql.connector.pooling), ficam ociosas e são reutilizadas no
+    próximo acquire(); quem espera por uma conexão é atendido em ordem de
+    chegada (FIFO).
+    Atributos:
+        min_size: int
+        max_size: int
+        idle_timeout: float (segundos que uma conexão pode ficar ociosa)
+        wait_timeout: float (segundos de espera máxima no acquire)
+        reset_session: bool (reinicia variáveis, tabelas temporárias e SET da sessão na devolução)
+    Métodos:
+        get_pool: ConnectionPool
+        close_all_pools: None
+        acquire: mysql.connector.connection.MySQLConnection
+        release: None
+        close: None
+        stats: dict
+'''
+class ConnectionPool:
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, host, database, user, password, min_size=0, max_size=10,
+                 idle_timeout=300, wait_timeout=30, reset_session=True):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Tamanhos inválidos para o pool: exige 0 <= min_size <= max_size e max_size >= 1")
+        self.host = host
+        self.database = database
+        self.user = user
+        self.password = password
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self.reset_session = reset_session
+        self._lock = threading.Lock()
+        self._ociosas = deque()    # (conexao, instante da devolução)
+        self._esperando = deque()  # [threading.Event, conexao entregue]
+        self._tamanho = 0
+        self._hits = 0
+        self._misses = 0
+        self._esperas = 0
+        self._timeouts = 0
+        self._tempo_espera = 0.0
+
+    @classmethod
+    def get_pool(cls, host, database, user, password, **opcoes):
+        # Retorna o pool do processo para (host, database, user), criando-o se necessário
+        chave = (host, database, user)
+        with cls._pools_lock:
+            pool = cls._pools.get(chave)
+            if pool is None:
+                pool = cls(host, database, user, password, **opcoes)
+                cls._pools[chave] = pool
+        if pool.min_size:
+            pool._preencher()
+        return pool
+
+    @classmethod
+    def close_all_pools(cls):
+        # Fecha todos os pools do processo
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+
+    def acquire(self, timeout=None):
+        # Empresta uma conexão do pool, aguardando em fila se o pool estiver cheio
+        timeout = self.wait_timeout if timeout is None else timeout
+        espera = None
+        with self._lock:
+            expiradas = self._descarta_ociosas()
+            if self._ociosas and not self._esperando:
+                conexao = self._ociosas.pop()[0]
+            elif self._tamanho < self.max_size:
+                self._tamanho += 1
+                conexao = _NOVA_CONEXAO
+            else:
+                espera = [threading.Event(), None]
+                self._esperando.append(espera)
+                self._esperas += 1
+        # O COM_QUIT das expiradas vai pela rede: feito fora do lock para não travar o pool
+        for expirada in expiradas:
+            self._fecha(expirada)
+
+        if espera is not None:
+            inicio = time.monotonic()
+            espera[0].wait(timeout)
+            with self._lock:
+                self._tempo_espera += time.monotonic() - inicio
+                conexao = espera[1]
+                if conexao is None:
+                    self._esperando.remove(espera)
+                    self._timeouts += 1
+                    raise PoolError(f"Timeout de {timeout}s aguardando conexão do pool {self.host}/{self.database}")
+
+        if conexao is not _NOVA_CONEXAO:
+            if self._conexao_viva(conexao):
+                with self._lock:
+                    self._hits += 1
+                return conexao
+            self._fecha(conexao)
+        return self._cria_conexao()
+
+    def release(self, conexao):
+        # Devolve a conexão ao pool, entregando-a direto ao primeiro da fila se houver espera.
+        # A transação aberta é desfeita e a sessão reiniciada, para que variáveis de usuário,
+        # tabelas temporárias e SET time_zone/sql_mode não passem para o próximo bloco "with";
+        # se isso falhar, a conexão é fechada
+        if conexao is not _NOVA_CONEXAO:
+            try:
+                if conexao.in_transaction:
+                    conexao.rollback()
+                if self.reset_session:
+                    conexao.reset_session()
+                    # O reinício desaloca as instruções preparadas no servidor
+                    _statement_caches.pop(conexao, None)
+            except Error:
+                _statement_caches.pop(conexao, None)
+                self._fecha(conexao)
+                conexao = _NOVA_CONEXAO
+        with self._lock:
+            if self._esperando:
+                espera = self._esperando.popleft()
+                espera[1] = conexao
+                espera[0].set()
+            elif conexao is _NOVA_CONEXAO:
+                self._tamanho -= 1
+            else:
+                self._ociosas.append((conexao, time.monotonic()))
+
+    def close(self):
+        # Fecha todas as conexões ociosas do pool
+        with self._lock:
+            ociosas = [conexao for conexao, _ in self._ociosas]
+            self._ociosas.clear()
+            self._tamanho -= len(ociosas)
+        for conexao in ociosas:
+            self._fecha(conexao)
+
+    def stats(self):
+        # Retorna as estatísticas de uso do pool
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "waits": self._esperas,
+                "timeouts": self._timeouts,
+                "wait_time": self._tempo_espera,
+                "size": self._tamanho,
+                "idle": len(self._ociosas),
+            }
+
+    def _preencher(self):
+        # Abre conexões até atingir min_size
+        while True:
+            with self._lock:
+                if self._tamanho >= self.min_size:
+                    return
+                self._tamanho += 1
+            conexao = self._cria_conexao()
+            self.release(conexao)
+
+    def _cria_conexao(self):
+        # Abre uma nova conexão para uma vaga já reservada no pool
+        try:
+            conexao = mysql.connector.connect(
+                host=self.host,
+                user=self.user,
+                password=self.password,
+                database=self.database
+            )
+        except Error:
+            self.release(_NOVA_CONEXAO)
+            raise
+        with self._lock:
+            self._misses += 1
+        return conexao
+
+    def _descarta_ociosas(self):
+        # Retira do pool as conexões ociosas há mais de idle_timeout, preservando min_size
+        # (chamado com o lock); quem chama fecha as retornadas depois de soltar o lock
+        limite = time.monotonic() - self.idle_timeout
+        expiradas = []
+        while self._ociosas and self._tamanho > self.min_size and self._ociosas[0][1] < limite:
+            expiradas.append(self._ociosas.popleft()[0])
+            self._tamanho -= 1
+        return expiradas
+
+    @staticmethod
+    def _conexao_viva(conexao):
+        try:
+            return conexao.is_connected()
+        except Error:
+            return False
+
+    @staticmethod
+    def _fecha(conexao):
+        try:
+            conexao.close()
+        except Error:
+            pass
+
+
+'''
+ Cache de resultados de leitura com LRU, TTL e invalidação por tabela
+
+    A chave é (host, database, SQL normalizado, parâmetros). Só consultas
+    SELECT/WITH cujas tabelas (de todas as listas FROM/JOIN, inclusive com
+    vírgula) puderam ser identificadas são guardadas; escritas feitas por
+    Connection invalidam as entradas que leem alguma das tabelas escritas, ou
+    todo o banco quando a escrita não pôde ser analisada. Uma instância pode ser compartilhada
+    por várias Connection para que o cache sobreviva aos blocos "with".
+    Atributos:
+        max_entries: int
+        max_bytes: int (estimativa do tamanho dos resultados guardados)
+        ttl: float (segundos de validade de cada entrada)
+    Métodos:
+        get: list
+        put: None
+        invalidate_query: int
+        invalidate_tables: int
+        clear: None
+        stats: dict
+'''
+class QueryCache:
+    # Em invalidate_tables, invalida todas as entradas do banco
+    TODAS = "*"
+    _LEITURA = re.compile(r"^\s*\(?\s*(select|with)\b", re.IGNORECASE)
+    _ESPACOS = re.compile(r"\s+")
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()  # chave -> (linhas, expira_em, bytes, tabelas)
+        self._por_tabela = {}           # tabela -> set(chaves)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def key(self, host, database, query, params):
+        # Monta a chave do cache, ou None se a consulta não for cacheável
+        if not self._LEITURA.match(query):
+            return None
+        sql = self._ESPACOS.sub(" ", query).strip().rstrip(";")
+        if _tabelas_lidas(sql) is None:
+            return None
+        return (host, database, sql, repr(params))
+
+    def get(self, chave):
+        # Retorna uma cópia das linhas guardadas, ou None se ausente/expirado
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self._misses += 1
+                return None
+            if entrada[1] < time.monotonic():
+                self._remove(chave)
+                self._misses += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self._hits += 1
+            return list(entrada[0])
+
+    def put(self, chave, linhas):
+        # Guarda o resultado de uma consulta, descartando as entradas menos usadas se preciso
+        linhas = list(linhas)
+        tamanho = _estima_bytes(linhas)
+        if tamanho > self.max_bytes:
+            return
+        tabelas = self.tables_read(chave[2])
+        with self._lock:
+            if chave in self._entradas:
+                self._remove(chave)
+            self._entradas[chave] = (linhas, time.monotonic() + self.ttl, tamanho, tabelas)
+            self._bytes += tamanho
+            for tabela in tabelas:
+                self._por_tabela.setdefault((chave[0], chave[1], tabela), set()).add(chave)
+            while self._entradas and (len(self._entradas) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entradas)))
+                self._evictions += 1
+
+    def invalidate_query(self, host, database, query):
+        # Invalida as entradas que leem as tabelas alteradas por uma query de escrita
+        tabelas = self.tables_written(query)
+        if not tabelas:
+            return 0
+        return self.invalidate_tables(host, database, *tabelas)
+
+    def invalidate_tables(self, host, database, *tabelas):
+        # Invalida todas as entradas que leem alguma das tabelas informadas (TODAS: o banco inteiro)
+        removidas = 0
+        with self._lock:
+            if self.TODAS in tabelas:
+                for chave in [chave for chave in self._entradas if chave[:2] == (host, database)]:
+                    self._remove(chave)
+                    removidas += 1
+                tabelas = ()
+            for tabela in tabelas:
+                for chave in self._por_tabela.pop((host, database, _nome_tabela(tabela)), ()):
+                    if chave in self._entradas:
+                        self._remove(chave)
+                        removidas += 1
+            self._invalidations += removidas
+        return removidas
+
+    def clear(self):
+        with self._lock:
+            self._entradas.clear()
+            self._por_tabela.clear()
+            self._bytes = 0
+
+    def stats(self):
+        # Retorna os contadores de uso do cache
+        with self._lock:
+            consultas = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / consultas if consultas else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "entries": len(self._entradas),
+                "bytes": self._bytes,
+            }
+
+    @staticmethod
+    def tables_read(query):
+        # Tabelas lidas pela consulta, ou None se ela não puder ser analisada (e por isso não é guardada)
+        return _tabelas_lidas(query)
+
+    @classmethod
+    def tables_written(cls, query):
+        # Tabelas alteradas pela query; (TODAS,) quando ela escreve mas não pôde ser analisada
+        tabelas = _tabelas_escritas(query)
+        return (cls.TODAS,) if tabelas is None else tabelas
+
+
+    def _remove(self, chave):
+        # Remove uma entrada e seus índices (chamado com o lock)
+        linhas, _, tamanho, tabelas = self._entradas.pop(chave)
+        self._bytes -= tamanho
+        for tabela in tabelas:
+            chaves = self._por_tabela.get((chave[0], chave[1], tabela))
+            if chaves is not None:
+                chaves.discard(chave)
+                if not chaves:
+                    del self._por_tabela[(chave[0], chave[1], tabela)]
+
+
+'''
+ Métricas por instrução SQL normalizada
+
+    Implementação padrão do gancho de instrumentação de Connection: qualquer
+    objeto com um método record(query, seconds, rows, nbytes) pode ser usado.
+    Literais são trocados por "?" para agrupar instruções equivalentes.
+    Atributos:
+        buckets: tuple (limites superiores do histograma, em segundos)
+        sample_size: int (latências recentes guardadas para os percentis)
+    Métodos:
+        record: None
+        normalize: str
+        snapshot: dict
+        export_histograms: dict
+        top_slow_statements: list
+        report: str
+        reset: None
+'''
+class StatementMetrics:
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    _STRINGS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+    _NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+    _LISTAS = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))+\s*\)")
+    _ESPACOS = re.compile(r"\s+")
+
+    def __init__(self, buckets=BUCKETS, sample_size=1024):
+        self.buckets = tuple(buckets)
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._instrucoes = {}
+
+    def record(self, query, seconds, rows=0, nbytes=0):
+        # Registra uma execução da instrução
+        instrucao = self.normalize(query)
+        with self._lock:
+            dados = self._instrucoes.get(instrucao)
+            if dados is None:
+                dados = {
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "rows": 0,
+                    "bytes": 0,
+                    "histogram": [0] * (len(self.buckets) + 1),
+                    "samples": deque(maxlen=self.sample_size),
+                }
+                self._instrucoes[instrucao] = dados
+            dados["count"] += 1
+            dados["total"] += seconds
+            dados["max"] = max(dados["max"], seconds)
+            dados["rows"] += rows or 0
+            dados["bytes"] += nbytes or 0
+            dados["histogram"][bisect_left(self.buckets, seconds)] += 1
+            dados["samples"].append(seconds)
+
+    @classmethod
+    def normalize(cls, query):
+        # Troca literais por "?" e colapsa listas IN (?, ?, ...) e espaços
+        sql = cls._STRINGS.sub("?", query)
+        sql = cls._NUMEROS.sub("?", sql)
+        sql = cls._LISTAS.sub("(?)", sql)
+        return cls._ESPACOS.sub(" ", sql).strip()
+
+    def snapshot(self):
+        # Retorna contagem, latência total/média/p50/p99/máxima, linhas e bytes por instrução
+        with self._lock:
+            itens = [(instrucao, dict(dados, samples=sorted(dados["samples"])))
+                     for instrucao, dados in self._instrucoes.items()]
+        resultado = {}
+        for instrucao, dados in itens:
+            amostras = dados["samples"]
+            resultado[instrucao] = {
+                "count": dados["count"],
+                "total": dados["total"],
+                "mean": dados["total"] / dados["count"],
+                "p50": self._percentil(amostras, 0.50),
+                "p99": self._percentil(amostras, 0.99),
+                "max": dados["max"],
+                "rows": dados["rows"],
+                "bytes": dados["bytes"],
+            }
+        return resultado
+
+    def export_histograms(self):
+        # Histograma cumulativo de latência por instrução: {instrucao: {limite: contagem, "+Inf": total}}
+        with self._lock:
+            itens = [(instrucao, list(dados["histogram"])) for instrucao, dados in self._instrucoes.items()]
+        exportado = {}
+        for instrucao, contagens in itens:
+            acumulado = 0
+            faixas = {}
+            for limite, contagem in zip(self.buckets + ("+Inf",), contagens):
+                acumulado += contagem
+                faixas[limite] = acumulado
+            exportado[instrucao] = faixas
+        return exportado
+
+    def top_slow_statements(self, n=10, by="total"):
+        # As n instruções com maior valor de "by" (total, mean, p50, p99, max)
+        return sorted(self.snapshot().items(), key=lambda item: item[1][by], reverse=True)[:n]
+
+    def report(self, n=10, by="total"):
+        # Relatório em texto das instruções mais lentas
+        linhas = [f"{'count':>8} {'total(s)':>10} {'p50(ms)':>9} {'p99(ms)':>9} {'rows':>10}  statement"]
+        for instrucao, dados in self.top_slow_statements(n, by):
+            linhas.append(
+                f"{dados['count']:>8} {dados['total']:>10.3f} {dados['p50'] * 1000:>9.2f} "
+                f"{dados['p99'] * 1000:>9.2f} {dados['rows']:>10}  {instrucao[:120]}"
+            )
+        return "\n".join(linhas)
+
+    def reset(self):
+        with self._lock:
+            self._instrucoes.clear()
+
+    @staticmethod
+    def _percentil(amostras, fracao):
+        if not amostras:
+            return 0.0
+        return amostras[min(len(amostras) - 1, int(fracao * len(amostras)))]
+
+
+class PartialWriteError(Error):
+    # Falha de execute_many/bulk_insert com commit_per_chunk=True depois de algum lote confirmado;
+    # rows_committed é quantas linhas do início da entrada já estão gravadas
+    def __init__(self, erro, rows_committed):
+        super().__init__(f"{erro} ({rows_committed} rows already committed)")
+        self.rows_committed = rows_committed
+
+
+class Connection:
+    # Folga mantida abaixo do max_allowed_packet ao montar INSERTs multi-linha
+    PACKET_MARGIN = 0.9
+    # Bytes estimados por valor além do seu texto (aspas, vírgula, escape)
+    VALUE_OVERHEAD = 4
+
+    def __init__(self, host, database, user, password, use_pool=True, pool_options=None, cache=None,
+                 statement_cache_size=0, instrumentation=None):
+        self.connection = None
+        self.cursor = None
+        self.pool = None
+        self.cache = cache
+        self.statement_cache_size = statement_cache_size
+        self.instrumentation = instrumentation
+        self.max_allowed_packet = None
+        self._transaction_depth = 0
+        self._tabelas_escritas = set()  # tabelas a invalidar no cache após o commit/rollback
+        self.host = host
+        self.database = database
+        self.user = user
+        self.password = password
+        self.use_pool = use_pool
+        self.pool_options = pool_options or {}
+
+    def connect(self):
+        # Conecta ao banco de dados (emprestando do pool quando use_pool=True)
+        try:
+            if self.use_pool:
+                self.pool = ConnectionPool.get_pool(
+                    self.host, self.database, self.user, self.password, **self.pool_options
+                )
+                self.connection = self.pool.acquire()
+            else:
+                self.connection = mysql.connector.connect(
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    database=self.database
+                )
+            self.cursor = self.connection.cursor()
+            print("Connected to MySQL database")
+            return True
+        except Error as e:
+            print(f"The error '{e}' occurred")
+            return False
+
+    def execute_query(self, query, params=None):
+        # Executa uma query no banco de dados
+        try:
+            inicio = time.perf_counter()
+            cursor = self._cursor_para(query)
+            cursor.execute(query, params)
+            self._instrumenta(query, inicio, max(cursor.rowcount, 0))
+            self._registra_escrita(query)
+            self._commit()
+            print("Query executed successfully")
+            return True
+        except Error as e:
+            print(f"The error '{e}' occurred")
+            if self._transaction_depth:
+                # Dentro de transaction() o erro sobe para que o bloco faça rollback
+                raise
+            self._invalida_cache()
+            return False
+
+    @contextmanager
+    def transaction(self):
+        # Agrupa as escritas em uma única transação: execute_query deixa de fazer commit
+        # a cada comando e o commit (ou rollback em caso de exceção) acontece na saída do bloco.
+        # Blocos aninhados usam SAVEPOINTs
+        self._transaction_depth += 1
+        savepoint = None
+        try:
+            if self._transaction_depth > 1:
+                savepoint = f"sp_{self._transaction_depth}"
+                self.cursor.execute(f"SAVEPOINT {savepoint}")
+            yield self
+        except BaseException:
+            if savepoint is not None:
+                self.cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            else:
+                try:
+                    self.connection.rollback()
+                finally:
+                    self._invalida_cache()
+            raise
+        else:
+            if savepoint is not None:
+                self.cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+            else:
+                try:
+                    self.connection.commit()
+                finally:
+                    self._invalida_cache()
+        finally:
+            self._transaction_depth -= 1
+
+    def _commit(self):
+        # Faz commit apenas fora de um bloco transaction(), invalidando o cache depois dele
+        if not self._transaction_depth:
+            try:
+                self.connection.commit()
+            finally:
+                self._invalida_cache()
+
+    def execute_many(self, query, rows, chunk_size=1000, commit_per_chunk=True):
+        # Executa a mesma query para várias linhas via executemany, em lotes de chunk_size.
+        # rows pode ser um gerador; commit_per_chunk=False usa uma única transação
+        rows = iter(rows)
+        lotes = iter(lambda: list(islice(rows, chunk_size)), [])
+        return self._executa_lotes(
+            ((query, lote, len(lote)) for lote in lotes), commit_per_chunk, many=True
+        )
+
+    def bulk_insert(self, table, columns, rows, chunk_size=1000, commit_per_chunk=True):
+        # Insere as linhas com INSERTs multi-linha, limitando cada lote a chunk_size linhas
+        # e ao max_allowed_packet do servidor; rows pode ser um gerador
+        colunas = ", ".join(self._quote_identifier(coluna) for coluna in columns)
+        prefixo = f"INSERT INTO {self._quote_identifier(table)} ({colunas}) VALUES "
+        marcador = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        try:
+            limite = int(self._get_max_allowed_packet() * self.PACKET_MARGIN) - len(prefixo)
+        except Error as e:
+            print(f"The error '{e}' occurred")
+            return None
+
+        def lotes():
+            lote, params, tamanho = [], [], 0
+            for row in rows:
+                tamanho_linha = len(marcador) + 2 + _bytes_linha(row) + self.VALUE_OVERHEAD * len(row)
+                if lote and (len(lote) >= chunk_size or tamanho + tamanho_linha > limite):
+                    yield prefixo + ", ".join(lote), params, len(lote)
+                    lote, params, tamanho = [], [], 0
+                lote.append(marcador)
+                params.extend(row)
+                tamanho += tamanho_linha
+            if lote:
+                yield prefixo + ", ".join(lote), params, len(lote)
+
+        return self._executa_lotes(lotes(), commit_per_chunk, many=False)
+
+    def _executa_lotes(self, lotes, commit_per_chunk, many):
+        # Executa os lotes (query, params, n_linhas) e retorna estatísticas de vazão
+        inicio = time.perf_counter()
+        total = 0
+        n_lotes = 0
+        gravadas = 0
+        try:
+            for query, params, n_linhas in lotes:
+                inicio_lote = time.perf_counter()
+                if many:
+                    self.cursor.executemany(query, params)
+                else:
+                    self.cursor.execute(query, params)
+                self._instrumenta(query, inicio_lote, n_linhas)
+                self._registra_escrita(query)
+                total += n_linhas
+                n_lotes += 1
+                if commit_per_chunk:
+                    self._commit()
+                    gravadas = total
+            if not commit_per_chunk:
+                self._commit()
+        except Error as e:
+            print(f"The error '{e}' occurred")
+            if self._transaction_depth:
+                raise
+            try:
+                self.connection.rollback()
+            except Error:
+                pass
+            self._invalida_cache()
+            if gravadas:
+                # Os lotes anteriores já foram confirmados: quem chama precisa saber de onde retomar
+                raise PartialWriteError(e, gravadas) from e
+            return None
+        duracao = time.perf_counter() - inicio
+        stats = {
+            "rows": total,
+            "chunks": n_lotes,
+            "seconds": duracao,
+            "rows_per_second": total / duracao if duracao > 0 else float("inf"),
+        }
+        print(f"{total} rows written in {n_lotes} chunks ({stats['rows_per_second']:.0f} rows/s)")
+        return stats
+
+    def _cursor_para(self, query):
+        # Retorna o cursor preparado em cache para a query (LRU por conexão física),
+        # ou o cursor comum quando statement_cache_size=0
+        if not self.statement_cache_size:
+            return self.cursor
+        cursores = _statement_caches.get(self.connection)
+        if cursores is None:
+            cursores = OrderedDict()
+            _statement_caches[self.connection] = cursores
+        cursor = cursores.get(query)
+        if cursor is not None:
+            cursores.move_to_end(query)
+            return cursor
+        cursor = self.connection.cursor(prepared=True)
+        cursores[query] = cursor
+        while len(cursores) > self.statement_cache_size:
+            _, antigo = cursores.popitem(last=False)
+            try:
+                antigo.close()
+            except Error:
+                pass
+        return cursor
+
+    def _instrumenta(self, query, inicio, linhas=0, nbytes=0):
+        # Repassa a execução ao gancho de instrumentação, se configurado
+        if self.instrumentation is not None:
+            self.instrumentation.record(query, time.perf_counter() - inicio, linhas, nbytes)
+
+    def _registra_escrita(self, query):
+        # Guarda as tabelas escritas pela query; o cache só é invalidado depois do commit (ou rollback),
+        # senão outra conexão poderia guardar de novo as linhas anteriores ao commit
+        if self.cache is not None:
+            self._tabelas_escritas.update(self.cache.tables_written(query))
+
+    def _invalida_cache(self):
+        # Descarta do cache os resultados que leem as tabelas escritas desde o último commit
+        if self._tabelas_escritas:
+            tabelas, self._tabelas_escritas = self._tabelas_escritas, set()
+            self.cache.invalidate_tables(self.host, self.database, *tabelas)
+
+    def _get_max_allowed_packet(self):
+        # Consulta (uma vez por instância) o max_allowed_packet do servidor
+        if self.max_allowed_packet is None:
+            self.cursor.execute("SELECT @@max_allowed_packet")
+            self.max_allowed_packet = int(self.cursor.fetchone()[0])
+        return self.max_allowed_packet
+
+    @staticmethod
+    def _quote_identifier(nome):
+        # Escapa nomes de tabela/coluna (aceita "banco.tabela")
+        return ".".join("`" + parte.replace("`", "``") + "`" for parte in nome.split("."))
+
+    def execute_read_query(self, query, params=None, use_cache=True):
+        # Executa uma query de leitura no banco de dados (passando pelo cache, se configurado)
+        result = None
+        chave = None
+        # Dentro de transaction() o cache é ignorado: as linhas lidas podem incluir escritas ainda não confirmadas
+        if self.cache is not None and use_cache and not self._transaction_depth:
+            chave = self.cache.key(self.host, self.database, query, params)
+            if chave is not None:
+                result = self.cache.get(chave)
+                if result is not None:
+                    return result
+        try:
+            inicio = time.perf_counter()
+            cursor = self._cursor_para(query)
+            cursor.execute(query, params)
+            result = cursor.fetchall()
+            if self.instrumentation is not None:
+                self._instrumenta(query, inicio, len(result), _estima_bytes(result))
+            if chave is not None:
+                self.cache.put(chave, result)
+            return result
+        except Error as e:
+            print(f"The error '{e}' occurred")
+            return result
+
+    def iter_read_query(self, query, params=None, batch_size=1000):
+        # Executa uma query de leitura em streaming: usa um cursor não bufferizado
+        # e entrega as linhas em lotes de fetchmany, sem carregar o resultado inteiro na memória
+        cursor = None
+        inicio = time.perf_counter()
+        total_linhas = 0
+        total_bytes = 0
+        try:
+            cursor = self.connection.cursor(buffered=False)
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                total_linhas += len(rows)
+                if self.instrumentation is not None:
+                    total_bytes += _estima_bytes(rows)
+                yield from rows
+            self._instrumenta(query, inicio, total_linhas, total_bytes)
+        except Error as e:
+            # Ao contrário de execute_read_query o erro sobe: quem consome o gerador
+            # precisa distinguir um resultado truncado de um resultado completo
+            print(f"The error '{e}' occurred after {total_linhas} rows")
+            raise
+        finally:
+            if cursor is not None:
+                try:
+                    # Descarta as linhas não lidas caso o consumidor pare antes do fim
+                    self.connection.consume_results()
+                    cursor.close()
+                except Error:
+                    pass
+
+    def disconnect(self):
+        # Desconecta do banco de dados (devolvendo a conexão ao pool quando emprestada)
+        if self.connection is not None and self.pool is not None:
+            try:
+                self.cursor.close()
+            except Error:
+                pass
+            self.pool.release(self.connection)
+            self.connection = None
+            self.cursor = None
+            print("Connection returned to pool")
+            return True
+        elif self.connection is not None and self.connection.is_connected():
+            self.cursor.close()
+            self.connection.close()
+            print("Connection closed")
+            return True
+        else:
+            print("No connection to close")
+            return False
+
+    def __enter__(self):
+        # Entra no contexto da classe
+        if self.connect():
+            return self
+        else:
+            raise Exception("Failed to connect to the database")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Sai do contexto da classe
+        self.disconnect()
+
+
+'''
+# Exemplo de uso da classe de conexão
+# Importando a classe de conexão
+from modules.connection import Connection
+
+# Criando uma instância da classe de conexão
+connection = Connection("localhost",
+'''
\ No newline at end of file
@@ -0,0 +1,7 @@
+from .._lazy import exporta_sob_demanda
+
+__getattr__, __dir__, __all__ = exporta_sob_demanda(globals(), {
+    'Criptografia': '.encripta',
+    'EscritorEncriptado': '.encripta',
+    'LeitorDesencriptado': '.encripta',
+})
@@ -0,0 +1,296 @@
+# Classe para encriptar e desencriptar texto
+'''
+Classe para encriptar e desencriptar texto
+Atributos:
+    c_a: int
+    c_b: int
+Métodos:
+    encriptar: str
+    desencriptar: str
+    encriptar_lote: list
+    desencriptar_lote: list
+    encriptar_arquivo: int
+    desencriptar_arquivo: int
+    abrir_escrita: EscritorEncriptado
+    abrir_leitura: LeitorDesencriptado
+
+'''
+
+# Valor máximo representável nos 6 dígitos hexadecimais de cada bloco
+_MAXIMO_BLOCO = 0xFFFFFF
+
+_NAO_CARREGADO = object()
+_np = _NAO_CARREGADO
+
+
+def _numpy():
+    # numpy é importado só no primeiro uso dos métodos em lote: encriptar/desencriptar não pagam o import.
+    # Ele é opcional: sem ele (None) os métodos em lote usam Python puro
+    global _np
+    if _np is _NAO_CARREGADO:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
+
+class Criptografia:
+
+    def __init__(self):
+        self.c_a = 0 #numero inteiro exemplo 131
+        self.c_b = 0 #numero inteiro exemplo 43342
+
+    def encriptar(self, s_textoEncriptar):
+        return "".join(
+            format(ord(c_carater) * self.c_a + self.c_b, '06x') for c_carater in s_textoEncriptar
+        )
+
+    def desencriptar(self, s_textoDesencriptar):
+        return "".join(
+            chr((int(s_textoDesencriptar[i:i+6], 16) - self.c_b) // self.c_a)
+            for i in range(0, len(s_textoDesencriptar), 6)
+        )
+
+    def encriptar_lote(self, l_textos):
+        # Encripta uma lista de textos de uma só vez; a saída é idêntica a [encriptar(t) for t in l_textos].
+        # Com numpy, todos os caracteres são processados juntos em um único vetor de códigos Unicode
+        l_textos = list(l_textos)
+        np = _numpy() if l_textos else None
+        if np is None:
+            return [self.encriptar(s_texto) for s_texto in l_textos]
+        s_todos = "".join(l_textos)
+        a_codigos = np.frombuffer(s_todos.encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.int64)
+        a_valores = a_codigos * self.c_a + self.c_b
+        if a_valores.size and (a_valores.min() < 0 or a_valores.max() > _MAXIMO_BLOCO):
+            # Valores fora de 6 dígitos mudam a largura do bloco: mantém o formato exato do método simples
+            return [self.encriptar(s_texto) for s_texto in l_textos]
+        s_hex = self._valores_para_hex(np, a_valores)
+        l_resultado = []
+        i_inicio = 0
+        for s_texto in l_textos:
+            i_fim = i_inicio + len(s_texto) * 6
+            l_resultado.append(s_hex[i_inicio:i_fim])
+            i_inicio = i_fim
+        return l_resultado
+
+    def desencriptar_lote(self, l_textos):
+        # Desencripta uma lista de textos de uma só vez; a saída é idêntica a [desencriptar(t) for t in l_textos]
+        l_textos = list(l_textos)
+        if not l_textos or self.c_a == 0 or any(len(s_texto) % 6 for s_texto in l_textos):
+            return [self.desencriptar(s_texto) for s_texto in l_textos]
+        np = _numpy()
+        if np is None:
+            return [self.desencriptar(s_texto) for s_texto in l_textos]
+        try:
+            a_bytes = np.frombuffer(bytes.fromhex("".join(l_textos)), dtype=np.uint8).reshape(-1, 3)
+        except ValueError:
+            return [self.desencriptar(s_texto) for s_texto in l_textos]
+        a_valores = (
+            (a_bytes[:, 0].astype(np.int64) << 16)
+            | (a_bytes[:, 1].astype(np.int64) << 8)
+            | a_bytes[:, 2].astype(np.int64)
+        )
+        a_codigos = (a_valores - self.c_b) // self.c_a
+        if a_codigos.size and (a_codigos.min() < 0 or a_codigos.max() > 0x10FFFF):
+            return [self.desencriptar(s_texto) for s_texto in l_textos]
+        s_todos = a_codigos.astype(np.uint32).tobytes().decode("utf-32-le", errors="surrogatepass")
+        l_resultado = []
+        i_inicio = 0
+        for s_texto in l_textos:
+            i_fim = i_inicio + len(s_texto) // 6
+            l_resultado.append(s_todos[i_inicio:i_fim])
+            i_inicio = i_fim
+        return l_resultado
+
+    def encriptar_arquivo(self, s_origem, s_destino, chunk_size=1 << 20, processos=None):
+        # Encripta um arquivo texto (utf-8) em blocos de chunk_size caracteres, com memória constante.
+        # Com processos > 1 os blocos são encriptados em paralelo, preservando a ordem. Retorna os caracteres lidos
+        with open(s_origem, "r", encoding="utf-8", newline="") as origem, \
+                open(s_destino, "w", encoding="ascii", newline="") as destino:
+            blocos = iter(lambda: origem.read(chunk_size), "")
+            return self._processa_blocos(blocos, destino, _encripta_bloco, processos)
+
+    def desencriptar_arquivo(self, s_origem, s_destino, chunk_size=1 << 20, processos=None):
+        # Desencripta um arquivo gerado por encriptar_arquivo; chunk_size é em caracteres do texto original.
+        # Os blocos lidos são alinhados a múltiplos de 6 dígitos hex. Retorna os caracteres gravados
+        with open(s_origem, "r", encoding="ascii", newline="") as origem, \
+                open(s_destino, "w", encoding="utf-8", newline="") as destino:
+            return self._processa_blocos(_blocos_alinhados(origem, chunk_size * 6), destino, _desencripta_bloco, processos)
+
+    def abrir_escrita(self, arquivo):
+        # Retorna um arquivo "de texto" cujo write() grava o conteúdo encriptado em `arquivo` (caminho ou objeto)
+        return EscritorEncriptado(self, arquivo)
+
+    def abrir_leitura(self, arquivo):
+        # Retorna um arquivo "de texto" cujo read() devolve o conteúdo desencriptado de `arquivo` (caminho ou objeto)
+        return LeitorDesencriptado(self, arquivo)
+
+    def _processa_blocos(self, blocos, destino, f_bloco, processos):
+        i_total = 0
+        if not processos or processos < 2:
+            for s_bloco in blocos:
+                s_resultado = f_bloco((self.c_a, self.c_b, s_bloco))
+                destino.write(s_resultado)
+                i_total += len(s_resultado if f_bloco is _desencripta_bloco else s_bloco)
+            return i_total
+        # multiprocessing só é importado quando usado: ele sozinho custa mais que o resto do módulo
+        import multiprocessing
+
+        # Envia no máximo 2 blocos por processo de cada vez para manter a memória limitada
+        with multiprocessing.Pool(processos) as pool:
+            while True:
+                l_janela = [(self.c_a, self.c_b, s_bloco) for _, s_bloco in zip(range(processos * 2), blocos)]
+                if not l_janela:
+                    return i_total
+                for (_, _, s_bloco), s_resultado in zip(l_janela, pool.map(f_bloco, l_janela)):
+                    destino.write(s_resultado)
+                    i_total += len(s_resultado if f_bloco is _desencripta_bloco else s_bloco)
+
+    @staticmethod
+    def _valores_para_hex(np, a_valores):
+        # Converte cada valor em 6 dígitos hexadecimais minúsculos, via tabela de nibbles
+        a_digitos = (a_valores[:, None] >> np.array([20, 16, 12, 8, 4, 0], dtype=np.int64)) & 0xF
+        a_tabela = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+        return a_tabela[a_digitos].tobytes().decode("ascii")
+
+
+class EscritorEncriptado:
+    # Objeto de arquivo: write(texto) grava o texto encriptado (6 dígitos hex por caractere)
+    def __init__(self, cripto, arquivo):
+        self.cripto = cripto
+        self._fechar = isinstance(arquivo, str)
+        self.arquivo = open(arquivo, "w", encoding="ascii", newline="") if self._fechar else arquivo
+
+    def write(self, s_texto):
+        self.arquivo.write(self.cripto.encriptar_lote([s_texto])[0])
+        return len(s_texto)
+
+    def writelines(self, l_linhas):
+        for s_linha in l_linhas:
+            self.write(s_linha)
+
+    def flush(self):
+        self.arquivo.flush()
+
+    def close(self):
+        if self._fechar:
+            self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class LeitorDesencriptado:
+    # Objeto de arquivo: read(n) devolve até n caracteres desencriptados, lendo só os 6*n dígitos necessários
+    def __init__(self, cripto, arquivo, chunk_size=1 << 16):
+        self.cripto = cripto
+        self.chunk_size = chunk_size
+        self._fechar = isinstance(arquivo, str)
+        self.arquivo = open(arquivo, "r", encoding="ascii", newline="") if self._fechar else arquivo
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            return "".join(self._blocos(self.chunk_size))
+        s_hex = _le_alinhado(self.arquivo, n * 6)
+        return self.cripto.desencriptar_lote([s_hex])[0] if s_hex else ""
+
+    def __iter__(self):
+        return self._blocos(self.chunk_size)
+
+    def _blocos(self, i_tamanho):
+        while True:
+            s_bloco = self.read(i_tamanho)
+            if not s_bloco:
+                return
+            yield s_bloco
+
+    def close(self):
+        if self._fechar:
+            self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _le_alinhado(arquivo, i_tamanho):
+    # Lê i_tamanho caracteres (múltiplo de 6), completando leituras curtas para não quebrar um bloco hex
+    s_dados = arquivo.read(i_tamanho)
+    while s_dados and len(s_dados) % 6:
+        s_resto = arquivo.read(6 - len(s_dados) % 6)
+        if not s_resto:
+            break
+        s_dados += s_resto
+    return s_dados
+
+
+def _blocos_alinhados(arquivo, i_tamanho):
+    while True:
+        s_dados = _le_alinhado(arquivo, i_tamanho)
+        if not s_dados:
+            return
+        yield s_dados
+
+
+def _encripta_bloco(t_args):
+    # Função de nível de módulo para poder ser enviada aos processos do Pool
+    i_a, i_b, s_bloco = t_args
+    cripto = Criptografia()
+    cripto.c_a, cripto.c_b = i_a, i_b
+    return cripto.encriptar_lote([s_bloco])[0]
+
+
+def _desencripta_bloco(t_args):
+    i_a, i_b, s_bloco = t_args
+    cripto = Criptografia()
+    cripto.c_a, cripto.c_b = i_a, i_b
+    return cripto.desencriptar_lote([s_bloco])[0]
+
+
+def _benchmark(i_quantidade=20000, i_tamanho=32):
+    # Compara encriptar/desencriptar item a item com as versões em lote
+    import random
+    import string
+    import timeit
+
+    cripto = Criptografia()
+    cripto.c_a = 131
+    cripto.c_b = 43342
+    l_textos = [
+        "".join(random.choices(string.ascii_letters + string.digits + "áéíóúç", k=i_tamanho))
+        for _ in range(i_quantidade)
+    ]
+    l_encriptados = cripto.encriptar_lote(l_textos)
+    assert l_encriptados == [cripto.encriptar(s_texto) for s_texto in l_textos]
+    assert cripto.desencriptar_lote(l_encriptados) == l_textos
+
+    f_simples = min(timeit.repeat(lambda: [cripto.encriptar(t) for t in l_textos], number=1, repeat=3))
+    f_lote = min(timeit.repeat(lambda: cripto.encriptar_lote(l_textos), number=1, repeat=3))
+    print(f"encriptar:    {f_simples:.3f}s item a item | {f_lote:.3f}s em lote | {f_simples / f_lote:.1f}x")
+    f_simples = min(timeit.repeat(lambda: [cripto.desencriptar(t) for t in l_encriptados], number=1, repeat=3))
+    f_lote = min(timeit.repeat(lambda: cripto.desencriptar_lote(l_encriptados), number=1, repeat=3))
+    print(f"desencriptar: {f_simples:.3f}s item a item | {f_lote:.3f}s em lote | {f_simples / f_lote:.1f}x")
+    print(f"({i_quantidade} textos de {i_tamanho} caracteres, numpy {'disponível' if _numpy() is not None else 'ausente'})")
+
+
+if __name__ == "__main__":
+    _benchmark()
+
+# Exemplo de uso:
+# encripta = Criptografia()
+# texto = "147845"
+# texto_encriptado = encripta.encriptar(texto)
+# print("\nTexto encriptado:", texto_encriptado)
+
+#texto_desencriptado = encripta.desencriptar("00c2dc00c2dc00cb6b00c1a300c8f900c68700c687")
+#print("\nTexto desencriptado:", texto_desencriptado)
+
+# Comparar o desempenho dos métodos em lote:
+# python -m modules.criptografia.encripta
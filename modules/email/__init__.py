@@ -0,0 +1,9 @@
+from .._lazy import exporta_sob_demanda
+
+__getattr__, __dir__, __all__ = exporta_sob_demanda(globals(), {
+    'EnviaEmail': '.enviaEmail',
+    'Template': '.enviaEmail',
+    'MensagemStream': '.enviaEmail',
+    'SessaoSMTP': '.enviaEmail',
+    'CaixaSaida': '.enviaEmail',
+})
@@ -0,0 +1,705 @@
+import atexit
+import base64
+import datetime
+import email.policy
+import io
+import re
+import smtplib
+import os
+import queue
+import threading
+import time
+import uuid
+import weakref
+import zlib
+from email.generator import BytesGenerator
+from email.message import EmailMessage
+from email.utils import getaddresses, parseaddr
+#from modules.config.ConfigHandler import ConfigHandler
+from ..config import ConfigHandler
+
+
+class Template:
+    """Template com placeholders no formato {nome}, compilado uma única vez.
+
+    O texto é dividido em trechos literais e nomes de campos; render() apenas
+    junta os pedaços, sem reescanear o texto. Chaves que não formam um
+    placeholder (ex.: CSS em HTML) e placeholders sem valor são mantidos como estão.
+    """
+
+    _PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+    def __init__(self, texto):
+        self.texto = texto
+        self._partes = self._PLACEHOLDER.split(texto)  # literais nas posições pares, campos nas ímpares
+        self.campos = frozenset(self._partes[1::2])
+
+    def render(self, contexto=None, **valores):
+        """Retorna o texto com os placeholders substituídos pelos valores do contexto."""
+        if contexto:
+            valores = {**contexto, **valores}
+        partes = self._partes[:]
+        for i in range(1, len(partes), 2):
+            valor = valores.get(partes[i])
+            partes[i] = "{" + partes[i] + "}" if valor is None else str(valor)
+        return "".join(partes)
+
+    def render_many(self, contextos, **valores):
+        """Renderiza o template para cada contexto (mala direta), sob demanda."""
+        for contexto in contextos:
+            yield self.render(contexto, **valores)
+
+
+class MensagemStream:
+    """E-mail cujos anexos são lidos, comprimidos e codificados em base64 em blocos,
+    direto para o socket SMTP, sem montar a mensagem inteira na memória.
+
+    O corpo é gerado normalmente pelo EmailMessage, com um marcador no lugar de
+    cada anexo; na transmissão cada marcador é substituído pelo conteúdo do arquivo.
+    """
+
+    # Múltiplo de 57 bytes: cada 57 bytes viram uma linha de 76 caracteres em base64
+    TAMANHO_BLOCO = 57 * 16384
+    EXTENSOES = {"gzip": (".gz", "gzip"), "zip": (".zip", "zip")}
+
+    def __init__(self, msg, bcc=None):
+        self.msg = msg
+        self.bcc = bcc or []
+        self._anexos = []
+
+    def __getitem__(self, cabecalho):
+        return self.msg[cabecalho]
+
+    def adicionar_anexo(self, caminho_anexo, compressao=None):
+        """Registra o arquivo como anexo em streaming (compressao: None, "gzip" ou "zip")."""
+        nome_arquivo = os.path.basename(caminho_anexo)
+        subtipo = "octet-stream"
+        if compressao:
+            extensao, subtipo = self.EXTENSOES[compressao]
+            nome_arquivo += extensao
+        marcador = f"ANEXO-{uuid.uuid4().hex}".encode()
+        self.msg.add_attachment(marcador, maintype="application", subtype=subtipo, filename=nome_arquivo)
+        marcador_base64 = base64.b64encode(marcador) + b"\r\n"
+        self._anexos.append((marcador_base64, caminho_anexo, compressao))
+
+    def enviar(self, smtp):
+        """Transmite a mensagem pela sessão SMTP já autenticada (MAIL FROM, RCPT TO, DATA)."""
+        remetente = parseaddr(self.msg["From"])[1]
+        destinos = [
+            endereco
+            for _, endereco in getaddresses(self.msg.get_all("To", []) + self.msg.get_all("Cc", []) + self.bcc)
+            if endereco
+        ]
+        smtp.ehlo_or_helo_if_needed()
+        codigo, resposta = smtp.mail(remetente)
+        if codigo != 250:
+            smtp.rset()
+            raise smtplib.SMTPSenderRefused(codigo, resposta, remetente)
+        recusados = {}
+        for destino in destinos:
+            codigo, resposta = smtp.rcpt(destino)
+            if codigo not in (250, 251):
+                recusados[destino] = (codigo, resposta)
+        if len(recusados) == len(destinos):
+            smtp.rset()
+            raise smtplib.SMTPRecipientsRefused(recusados)
+        # Os anexos são abertos antes do DATA: um arquivo ausente ou ilegível falha
+        # com a sessão ainda limpa, e não no meio do corpo da mensagem
+        try:
+            anexos = self._abrir_anexos()
+        except BaseException:
+            smtp.rset()
+            raise
+        try:
+            codigo, resposta = smtp.docmd("data")
+            if codigo != 354:
+                smtp.rset()
+                raise smtplib.SMTPDataError(codigo, resposta)
+            for bloco in self._blocos(anexos):
+                smtp.send(bloco)
+            smtp.send(b".\r\n")
+            codigo, resposta = smtp.getreply()
+            if codigo != 250:
+                raise smtplib.SMTPDataError(codigo, resposta)
+        finally:
+            for _, arquivo, _ in anexos:
+                arquivo.close()
+        return recusados
+
+    def _abrir_anexos(self):
+        # Abre cada anexo e prepara o compressor dele: [(marcador, arquivo, compressor)]
+        anexos = []
+        try:
+            for marcador, caminho, compressao in self._anexos:
+                arquivo = open(caminho, "rb")
+                anexos.append((marcador, arquivo, None))
+                anexos[-1] = (marcador, arquivo, self._compressor(caminho, compressao))
+        except BaseException:
+            # Inclui o arquivo recém-aberto cujo compressor falhou
+            for _, arquivo, _ in anexos:
+                arquivo.close()
+            raise
+        return anexos
+
+    @staticmethod
+    def _compressor(caminho, compressao):
+        # Compressor de um anexo: zlib para gzip, (buffer, ZipFile, entrada) para zip, None sem compressão
+        if compressao == "gzip":
+            return zlib.compressobj(6, zlib.DEFLATED, 31)
+        if compressao == "zip":
+            import zipfile  # só anexos em .zip precisam dele
+
+            buffer = _BufferSaida()
+            arquivo_zip = zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED)
+            return buffer, arquivo_zip, arquivo_zip.open(os.path.basename(caminho), "w", force_zip64=True)
+        return None
+
+    def _blocos(self, anexos):
+        # Gera a mensagem em blocos: trechos do esqueleto intercalados com os anexos em base64
+        saida = io.BytesIO()
+        BytesGenerator(saida, policy=email.policy.SMTP).flatten(self.msg)
+        esqueleto = saida.getvalue()
+        if not esqueleto.endswith(b"\r\n"):
+            esqueleto += b"\r\n"
+        for marcador, arquivo, compressor in anexos:
+            antes, esqueleto = esqueleto.split(marcador, 1)
+            yield re.sub(rb"(?m)^\.", b"..", antes)
+            yield from self._base64_em_linhas(self._conteudo(arquivo, compressor))
+        yield re.sub(rb"(?m)^\.", b"..", esqueleto)
+
+    def _conteudo(self, arquivo, compressor):
+        # Lê o arquivo já aberto em blocos, comprimindo sob demanda
+        blocos = iter(lambda: arquivo.read(self.TAMANHO_BLOCO), b"")
+        if isinstance(compressor, tuple):
+            buffer, arquivo_zip, destino = compressor
+            with arquivo_zip, destino:
+                for bloco in blocos:
+                    destino.write(bloco)
+                    yield buffer.esvaziar()
+            yield buffer.esvaziar()
+        elif compressor is not None:
+            for bloco in blocos:
+                yield compressor.compress(bloco)
+            yield compressor.flush()
+        else:
+            yield from blocos
+
+    def _base64_em_linhas(self, blocos):
+        # Codifica em linhas base64 de 76 caracteres terminadas em CRLF, guardando o resto entre blocos
+        resto = b""
+        for bloco in blocos:
+            dados = resto + bloco
+            corte = len(dados) - len(dados) % 57
+            resto = dados[corte:]
+            if corte:
+                yield base64.encodebytes(dados[:corte]).replace(b"\n", b"\r\n")
+        if resto:
+            yield base64.encodebytes(resto).replace(b"\n", b"\r\n")
+
+
+class _BufferSaida:
+    # Destino sem seek para o ZipFile: acumula os bytes escritos até serem consumidos
+    def __init__(self):
+        self._dados = bytearray()
+
+    def write(self, dados):
+        self._dados += dados
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self):
+        dados = bytes(self._dados)
+        self._dados.clear()
+        return dados
+
+
+class SessaoSMTP:
+    """Sessão SMTP persistente (EHLO + STARTTLS + LOGIN uma única vez) reaproveitada entre envios.
+
+    Reconecta automaticamente quando o servidor derruba a conexão, quando a sessão
+    atinge max_mensagens envios ou quando fica ociosa por mais de timeout_ocioso segundos.
+    timeout limita, em segundos, cada operação no socket (conexão, comandos, DATA).
+    """
+
+    def __init__(self, servidor, porta, usuario, senha, max_mensagens=100, timeout_ocioso=60, timeout=30):
+        self.servidor = servidor
+        self.porta = porta
+        self.usuario = usuario
+        self.senha = senha
+        self.max_mensagens = max_mensagens
+        self.timeout_ocioso = timeout_ocioso
+        self.timeout = timeout
+        self._smtp = None
+        self._enviadas = 0
+        self._ultimo_uso = 0.0
+        self._lock = threading.Lock()
+
+    def enviar(self, msg):
+        """Envia a mensagem pela sessão, reabrindo-a uma vez se o servidor tiver desconectado.
+
+        Qualquer outra falha (exceto recusa de remetente/destinatários, após a qual o
+        servidor já recebeu RSET) descarta a sessão: ela pode ter ficado no meio de um DATA.
+        """
+        with self._lock:
+            try:
+                try:
+                    self._transmitir(self._sessao_ativa(), msg)
+                except smtplib.SMTPServerDisconnected:
+                    self._descartar()
+                    self._transmitir(self._sessao_ativa(), msg)
+            except (smtplib.SMTPSenderRefused, smtplib.SMTPRecipientsRefused):
+                raise
+            except BaseException:
+                self._descartar()
+                raise
+            self._enviadas += 1
+            self._ultimo_uso = time.monotonic()
+
+    def fechar(self):
+        """Encerra a sessão com QUIT, se estiver aberta."""
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except smtplib.SMTPException:
+                    pass
+                finally:
+                    self._descartar()
+
+    @staticmethod
+    def _transmitir(smtp, msg):
+        if isinstance(msg, MensagemStream):
+            msg.enviar(smtp)
+        else:
+            smtp.send_message(msg)
+
+    def _sessao_ativa(self):
+        expirada = (
+            self._enviadas >= self.max_mensagens
+            or time.monotonic() - self._ultimo_uso > self.timeout_ocioso
+        )
+        if self._smtp is not None and expirada:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._descartar()
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.servidor, self.porta, timeout=self.timeout)
+            try:
+                smtp.ehlo()
+                smtp.starttls()  # Ativar criptografia TLS
+                smtp.login(self.usuario, self.senha)
+            except Exception:
+                smtp.close()
+                raise
+            self._smtp = smtp
+            self._enviadas = 0
+        return self._smtp
+
+    def _descartar(self):
+        if self._smtp is not None:
+            self._smtp.close()
+        self._smtp = None
+        self._enviadas = 0
+
+
+# Caixas de saída ainda abertas, esvaziadas ao encerrar o processo
+_caixas_abertas = weakref.WeakSet()
+
+
+@atexit.register
+def _esvazia_caixas():
+    # Os workers são daemon: sem isto um robô que sai sem fechar() perderia a fila. A espera é
+    # limitada por timeout_saida, para um servidor que não responde não travar o encerramento
+    for caixa in list(_caixas_abertas):
+        if not caixa.close(caixa.timeout_saida):
+            print(f"{caixa.pendentes} e-mail(s) não entregue(s) em {caixa.timeout_saida}s ao encerrar o processo")
+
+
+class CaixaSaida:
+    """Fila de envio em segundo plano drenada por um pool de workers, cada um com sua SessaoSMTP.
+
+    enfileirar() retorna imediatamente; os workers respeitam o limite de
+    mensagens_por_segundo (compartilhado entre eles) e repetem envios com falha
+    até max_tentativas, com espera exponencial a partir de backoff segundos.
+    Mensagens que esgotam as tentativas ficam em self.falhas como (msg, erro).
+    Caixas não fechadas são esvaziadas (close(timeout_saida)) ao encerrar o processo.
+    """
+
+    # Erros permanentes: repetir o envio não adianta
+    ERROS_SEM_RETENTATIVA = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)
+
+    def __init__(self, criar_sessao, workers=2, mensagens_por_segundo=None, max_tentativas=3, backoff=2.0,
+                 timeout_saida=60):
+        self.max_tentativas = max_tentativas
+        self.timeout_saida = timeout_saida
+        self.backoff = backoff
+        self.intervalo = 1.0 / mensagens_por_segundo if mensagens_por_segundo else 0.0
+        self.falhas = []
+        self._fila = queue.Queue()
+        self._pendentes = 0
+        self._condicao = threading.Condition()
+        self._lock_taxa = threading.Lock()
+        self._proximo_envio = 0.0
+        self._fechada = False
+        self._sessoes = [criar_sessao() for _ in range(workers)]
+        self._workers = [
+            threading.Thread(target=self._trabalhar, args=(sessao,), name=f"CaixaSaida-{i}", daemon=True)
+            for i, sessao in enumerate(self._sessoes)
+        ]
+        for worker in self._workers:
+            worker.start()
+        _caixas_abertas.add(self)
+
+    @property
+    def pendentes(self):
+        """Mensagens enfileiradas ainda não entregues nem descartadas."""
+        with self._condicao:
+            return self._pendentes
+
+    def enfileirar(self, msg):
+        """Coloca a mensagem na fila de envio sem bloquear."""
+        # Sob o mesmo lock de close(): nada entra na fila depois dos sinais de parada dos workers
+        with self._condicao:
+            if self._fechada:
+                raise RuntimeError("Caixa de saída já foi fechada.")
+            self._pendentes += 1
+            self._fila.put(msg)
+
+    def flush(self, timeout=None):
+        """Aguarda até que todas as mensagens enfileiradas tenham sido entregues ou descartadas.
+
+        Retorna False se o timeout expirar antes disso.
+        """
+        with self._condicao:
+            return self._condicao.wait_for(lambda: self._pendentes == 0, timeout)
+
+    def close(self, timeout=None):
+        """Aguarda a entrega das mensagens pendentes, encerra os workers e fecha as sessões.
+
+        Com timeout, a espera toda dura no máximo timeout segundos; retorna False se ainda
+        restarem mensagens (os workers ocupados são abandonados, com as sessões deles).
+        """
+        with self._condicao:
+            if self._fechada:
+                return True
+            self._fechada = True
+        _caixas_abertas.discard(self)
+        limite = None if timeout is None else time.monotonic() + timeout
+        entregue = self.flush(timeout)
+        for _ in self._workers:
+            self._fila.put(None)
+        for worker in self._workers:
+            worker.join(None if limite is None else max(0.0, limite - time.monotonic()))
+        for worker, sessao in zip(self._workers, self._sessoes):
+            if not worker.is_alive():
+                sessao.fechar()
+        return entregue
+
+    def _trabalhar(self, sessao):
+        while True:
+            msg = self._fila.get()
+            if msg is None:
+                return
+            try:
+                self._entregar(sessao, msg)
+            finally:
+                with self._condicao:
+                    self._pendentes -= 1
+                    self._condicao.notify_all()
+
+    def _entregar(self, sessao, msg):
+        for tentativa in range(1, self.max_tentativas + 1):
+            self._aguardar_taxa()
+            try:
+                sessao.enviar(msg)
+                return
+            except Exception as e:
+                if isinstance(e, self.ERROS_SEM_RETENTATIVA) or tentativa == self.max_tentativas:
+                    print(f"Erro ao enviar e-mail para {msg['To']}: {e}")
+                    self.falhas.append((msg, e))
+                    return
+                time.sleep(self.backoff * 2 ** (tentativa - 1))
+
+    def _aguardar_taxa(self):
+        if not self.intervalo:
+            return
+        with self._lock_taxa:
+            agora = time.monotonic()
+            espera = self._proximo_envio - agora
+            self._proximo_envio = max(agora, self._proximo_envio) + self.intervalo
+        if espera > 0:
+            time.sleep(espera)
+
+
+class EnviaEmail:
+    def __init__(self, config_path="config/config.json", nao_bloqueante=False):
+        """Inicializa a classe com as credenciais do servidor SMTP."""
+        self.config = ConfigHandler(config_path)  # Usa a nova classe corretamente
+        email_config = self.config.get_data("email")  # Obtém a seção "email"
+        self.nome_robo = self.config.get_data("nome_robo") or "Robô Desconhecido"  # Se não existir, usa um valor padrão
+
+        if not email_config:
+            raise ValueError("❌ Configuração de e-mail não encontrada no arquivo JSON.")
+
+        self.servidor_smtp = self.config.get_data("email.smtp_server", None)
+        self.porta = self.config.get_data("email.smtp_port", None)
+        self.usuario = self.config.get_data("email.user", None)
+        self.senha = self.config.get_data("email.password", None)
+        self.from_ = self.config.get_data("email.from", None)
+        self.alias = self.config.get_data("email.alias", None)
+        self.cc = self.config.get_data("email.cc", None) or []
+        self.email_log = self.config.get_data("email.email_log", None)
+        self.destinatario = self.config.get_data("email.destinatario", None)
+        self.sessao = SessaoSMTP(
+            self.servidor_smtp,
+            self.porta,
+            self.usuario,
+            self.senha,
+            max_mensagens=self.config.get_data("email.max_mensagens_sessao", 100),
+            timeout_ocioso=self.config.get_data("email.timeout_ocioso", 60.0),
+            timeout=self.config.get_data("email.timeout_smtp", 30.0),
+        )
+        self.caixa_saida = None
+        if nao_bloqueante:
+            self.caixa_saida = CaixaSaida(
+                lambda: SessaoSMTP(
+                    self.servidor_smtp,
+                    self.porta,
+                    self.usuario,
+                    self.senha,
+                    max_mensagens=self.config.get_data("email.max_mensagens_sessao", 100),
+                    timeout_ocioso=self.config.get_data("email.timeout_ocioso", 60.0),
+                    timeout=self.config.get_data("email.timeout_smtp", 30.0),
+                ),
+                workers=self.config.get_data("email.workers", 2),
+                mensagens_por_segundo=self.config.get_data("email.mensagens_por_segundo", None),
+                max_tentativas=self.config.get_data("email.max_tentativas", 3),
+                backoff=self.config.get_data("email.backoff", 2.0),
+                timeout_saida=self.config.get_data("email.timeout_saida", 60.0),
+            )
+        # Anexos a partir deste tamanho são enviados em streaming
+        self.limite_anexo_streaming = int(self.config.get_data("email.anexo_streaming_mb", 10.0) * 1024 * 1024)
+        self.compressao_anexo = self.config.get_data("email.compressao_anexo", None)
+        self.templates = {}
+        self.recarregar_templates()
+
+    def recarregar_templates(self):
+        """Compila os templates de assunto/corpo de process_success e process_error da configuração."""
+        self.templates = {}
+        for secao in ("process_success", "process_error"):
+            process_config = self.config.get_data(secao)
+            if process_config:
+                self.templates[secao] = (Template(process_config["subject"]), Template(process_config["body"]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.fechar()
+
+    def fechar(self):
+        """Aguarda a caixa de saída (se houver) e encerra as sessões SMTP."""
+        if self.caixa_saida is not None:
+            self.caixa_saida.close()
+        self.sessao.fechar()
+
+    def flush(self, timeout=None):
+        """Aguarda a entrega dos e-mails enfileirados no modo não bloqueante."""
+        if self.caixa_saida is None:
+            return True
+        return self.caixa_saida.flush(timeout)
+
+    def enviar_email(self, destinatario, assunto, mensagem, anexo=None, cc=None, bcc=None, compressao=None):
+        """Envia um e-mail com suporte a HTML, anexo opcional, cópia (CC) e cópia oculta (BCC).
+
+        Anexos grandes (ou com compressao="gzip"/"zip") são enviados em streaming.
+        """
+        try:
+            msg = self._montar_mensagem(destinatario, assunto, mensagem, anexo, cc, bcc, compressao)
+            if self.caixa_saida is not None:
+                self.caixa_saida.enfileirar(msg)
+                print(" E-mail enfileirado para envio.")
+                return True
+            self.sessao.enviar(msg)
+            print(" E-mail enviado com sucesso!")
+            return True
+
+        except Exception as e:
+            print(f"Erro ao enviar e-mail: {e}")
+            return False
+
+    def enviar_lote(self, mensagens):
+        """Envia vários e-mails pela mesma sessão SMTP.
+
+        Cada item é um dict com os argumentos de enviar_email (destinatario, assunto,
+        mensagem, anexo, cc, bcc). Retorna uma lista, na mesma ordem, de dicts
+        {"destinatario", "enviado", "erro"}.
+        """
+        return self._enviar_itens(mensagens, lambda item: item)
+
+    def _enviar_itens(self, itens, preparar):
+        """Envia cada item pela sessão; preparar(item) gera os argumentos de enviar_email.
+
+        preparar roda dentro do try de cada item: um item inválido vira um resultado
+        com erro em vez de interromper o lote.
+        """
+        resultados = []
+        for original in itens:
+            try:
+                item = preparar(original)
+                msg = self._montar_mensagem(
+                    item["destinatario"],
+                    item["assunto"],
+                    item["mensagem"],
+                    item.get("anexo"),
+                    item.get("cc"),
+                    item.get("bcc"),
+                    item.get("compressao"),
+                )
+                self.sessao.enviar(msg)
+                resultados.append({"destinatario": item["destinatario"], "enviado": True, "erro": None})
+            except Exception as e:
+                destinatario = original.get("destinatario") if isinstance(original, dict) else None
+                # str(KeyError) traz só o nome da chave: o repr deixa claro que o campo faltou
+                erro = repr(e) if isinstance(e, KeyError) else str(e)
+                resultados.append({"destinatario": destinatario, "enviado": False, "erro": erro})
+        enviados = sum(1 for resultado in resultados if resultado["enviado"])
+        print(f" Lote enviado: {enviados}/{len(resultados)} e-mails.")
+        return resultados
+
+    def _montar_mensagem(self, destinatario, assunto, mensagem, anexo=None, cc=None, bcc=None, compressao=None):
+        """Monta o EmailMessage com remetente, cópias e anexo (ou um MensagemStream para anexos grandes)."""
+        msg = EmailMessage()
+        msg["From"] = f"{self.alias} <{self.from_}>"
+        msg["To"] = destinatario
+        msg["Subject"] = assunto
+        msg.set_content(mensagem, subtype="html")
+        cc = cc or self.cc
+
+        if cc:
+            msg["Cc"] = ", ".join(cc) if isinstance(cc, list) else cc
+
+        compressao = compressao or self.compressao_anexo
+        if anexo and os.path.exists(anexo) and (compressao or os.path.getsize(anexo) >= self.limite_anexo_streaming):
+            # Bcc não vai no cabeçalho: os endereços são usados só no RCPT TO
+            msg_stream = MensagemStream(msg, bcc=[bcc] if isinstance(bcc, str) else list(bcc or []))
+            msg_stream.adicionar_anexo(anexo, compressao)
+            return msg_stream
+
+        if bcc:
+            msg["Bcc"] = ", ".join(bcc) if isinstance(bcc, list) else bcc
+
+        if anexo:
+            self._adicionar_anexo(msg, anexo)
+        return msg
+
+    def _adicionar_anexo(self, msg, caminho_anexo):
+        """Adiciona um anexo ao e-mail."""
+        try:
+            if not os.path.exists(caminho_anexo):
+                print(f" Arquivo {caminho_anexo} não encontrado!")
+                return
+
+            with open(caminho_anexo, "rb") as arquivo:
+                dados = arquivo.read()
+                nome_arquivo = os.path.basename(caminho_anexo)
+                msg.add_attachment(dados, maintype="application", subtype="octet-stream", filename=nome_arquivo)
+
+        except Exception as e:
+            print(f" Erro ao adicionar anexo: {e}")
+
+    def enviar_email_sucesso(self, file_path=None, destinatario=None, cc=None, bcc=None, mensagem=None):
+        """Envia um e-mail informando que o relatório CTE foi gerado com sucesso."""
+        templates = self.templates.get("process_success")
+        cc = self.cc or cc
+        destinatario = self.destinatario
+
+        if not templates:
+            raise ValueError(" Configuração de sucesso do processo não encontrada no arquivo JSON.")
+
+        # Substituir variáveis no template
+        contexto = self._contexto_padrao(mensagem=mensagem or "")
+        assunto_email = templates[0].render(contexto)
+        mensagem_email = templates[1].render(contexto)
+
+        self.enviar_email(destinatario, assunto_email, mensagem_email, anexo=file_path, cc=cc or [], bcc=bcc or [])
+
+        if os.path.exists(file_path):
+            print(f" Arquivo {file_path} removido após envio.")
+
+    def enviar_email_erro(self, destinatario=None, error_message=None, cc=None, bcc=None):
+        """Envia um e-mail informando sobre um erro no processo."""
+        templates = self.templates.get("process_error")
+        cc = self.cc or cc
+        destinatario = self.email_log
+
+        if not templates:
+            raise ValueError(" Configuração de erro do processo não encontrada no arquivo JSON.")
+
+        # Substituir variáveis no template
+        contexto = self._contexto_padrao(mensagem=error_message or "")
+        assunto_email = templates[0].render(contexto)
+        mensagem_email = templates[1].render(contexto)
+
+        self.enviar_email(destinatario, assunto_email, mensagem_email, cc=cc or [], bcc=bcc or [])
+
+    def enviar_mala_direta(self, assunto, mensagem, contextos, anexo=None, cc=None, bcc=None):
+        """Envia um e-mail personalizado por contexto, em lote pela mesma sessão SMTP.
+
+        assunto e mensagem são textos (ou Template) com placeholders {nome}; cada
+        contexto é um dict com "destinatario" e os valores dos placeholders
+        (além de {data} e {NomeRobo}, preenchidos automaticamente). Um contexto
+        pode trazer "anexo" próprio. Retorna os resultados de enviar_lote.
+        """
+        template_assunto = assunto if isinstance(assunto, Template) else Template(assunto)
+        template_mensagem = mensagem if isinstance(mensagem, Template) else Template(mensagem)
+        padrao = self._contexto_padrao()
+
+        def preparar(contexto):
+            contexto = {**padrao, **contexto}
+            return {
+                "destinatario": contexto["destinatario"],
+                "assunto": template_assunto.render(contexto),
+                "mensagem": template_mensagem.render(contexto),
+                "anexo": contexto.get("anexo", anexo),
+                "cc": cc,
+                "bcc": bcc,
+            }
+
+        return self._enviar_itens(contextos, preparar)
+
+    def _contexto_padrao(self, **valores):
+        """Valores comuns a todos os templates: {data} e {NomeRobo}."""
+        return {"data": datetime.datetime.now().strftime("%d/%m/%Y"), "NomeRobo": self.nome_robo, **valores}
+
+# Teste de envio de e-mail
+
+# def teste_envio_email():
+#     enviador = EnviaEmail()
+#     enviador.enviar_email(
+#         destinatario="yago.faria@friopecas.com.br",
+#         assunto="Teste de E-mail com CC",
+#         mensagem="<h1>Olá, todos!</h1><p>Esse e-mail tem cópia.</p>",
+#         anexo=r"C:\Users\yago.faria\Desktop\Desenvolvimento\AutomacaoCTE\data\resultado_190225.xlsx",
+#         cc=["luis.ayerbe@friopecas.com.br"],  # Lista de e-mails em cópia
+#         bcc=[]  # Lista de e-mails ocultos
+#     )
+
+# if __name__ == "__main__":
+#     #teste_envio_email()
+#     enviador = EnviaEmail()
+#     enviador.enviar_email_cte_sucesso(
+#         file_path=r"C:\Users\yago.faria\Desktop\Desenvolvimento\AutomacaoCTE\data\resultado_190225.xlsx",
+#         destinatario="yago.faria@friopecas.com.br",
+#         cc=["luis.ayerbe@friopeças.com.br"]
+#     )
+
+#     enviador.enviar_email_de_erro(
+#         destinatario="yago.faria@friopecas.com.br",
+#         error_message="Falha ao conectar ao banco de dados. Timeout atingido.",
+#         cc=["luis.ayerbe@friopecas.com.br"]
+#     )
@@ -0,0 +1,28 @@
+# Autor: Yago Assis Mendes Faria
+import os
+import shutil
+import sys
+import tempfile
+
+'''
+ Configuração dos testes (pytest)
+
+    Os testes rodam offline com os mesmos substitutos locais dos benchmarks
+    (benchmarks/standins.py): mysql.connector e aiomysql sobre um arquivo
+    SQLite e uma chain falsa no lugar do LLM. Os drivers substitutos são
+    registrados aqui, antes de qualquer teste importar modules.connection.
+'''
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [RAIZ, os.path.join(RAIZ, 'benchmarks')]
+
+import standins  # noqa: E402
+
+PASTA = tempfile.mkdtemp(prefix='testes-helpers-')
+BANCO = os.path.join(PASTA, 'banco.sqlite')
+standins.instala_mysql_sqlite(BANCO)
+standins.instala_aiomysql_sqlite(BANCO)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(PASTA, ignore_errors=True)
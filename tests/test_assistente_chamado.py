@@ -0,0 +1,102 @@
+# Autor: Yago Assis Mendes Faria
+import asyncio
+import itertools
+import json
+
+import pytest
+
+import standins
+from modules.chamado import AssistenteChamado
+
+'''
+ Testes de AssistenteChamado com a ChainFalsa no lugar de prompt | llm | parser
+'''
+
+_modelos = itertools.count()
+
+
+@pytest.fixture
+def cria_assistente(tmp_path):
+    # Cria assistentes com um modelo próprio por teste: a chain falsa entra no registro de
+    # componentes compartilhados, que é por configuração de modelo
+    chaves = []
+
+    def cria(cache=False, **opcoes_chain):
+        modelo = {'model': f'falso-{next(_modelos)}', 'temperature': 0.0, 'max_tokens': 256,
+                  'prompt_zanthus': 'Gere o chamado.'}
+        if cache:
+            modelo['cache'] = {'caminho': str(tmp_path / 'cache.sqlite'), 'ttl': 3600}
+        caminho = tmp_path / f"config_{modelo['model']}.json"
+        caminho.write_text(json.dumps({'api_keys': {'OPENAI_API_KEY': 'sk-falsa'}, 'model': modelo}), encoding='utf-8')
+        assistente = AssistenteChamado(str(caminho))
+        chave = (assistente.model, assistente.temperature, assistente.max_tokens, assistente.api_key)
+        AssistenteChamado._componentes_compartilhados[chave] = {
+            'prompt': None, 'llm': None, 'parser': None, 'chain': standins.ChainFalsa(**opcoes_chain),
+        }
+        chaves.append((chave, assistente))
+        return assistente
+
+    yield cria
+    for chave, assistente in chaves:
+        AssistenteChamado._componentes_compartilhados.pop(chave, None)
+        if assistente.cache is not None:
+            assistente.cache.fechar()
+
+
+def _entradas(quantidade):
+    return [f'Serviço {i} parado' for i in range(quantidade)]
+
+
+def test_lote_mantem_a_ordem_das_entradas(cria_assistente):
+    entradas = _entradas(8)
+    # As primeiras entradas demoram mais: terminam por último, mas continuam nas primeiras posições
+    assistente = cria_assistente(latencias={entrada: 0.02 - i * 0.002 for i, entrada in enumerate(entradas)})
+    esperado = [standins.ChainFalsa.resposta(entrada) for entrada in entradas]
+    assert assistente.gerar_textos_chamado(entradas, max_concurrency=8) == esperado
+    assert asyncio.run(assistente.agerar_textos_chamado(entradas, max_concurrency=8)) == esperado
+
+
+def test_lote_devolve_a_excecao_no_lugar_do_item_que_falhou(cria_assistente):
+    entradas = _entradas(5)
+    assistente = cria_assistente(falhar_em={entradas[1], entradas[3]})
+    for resultados in (assistente.gerar_textos_chamado(entradas),
+                       asyncio.run(assistente.agerar_textos_chamado(entradas))):
+        for i, (entrada, resultado) in enumerate(zip(entradas, resultados)):
+            if i in (1, 3):
+                assert isinstance(resultado, standins.ErroLLMFalso)
+            else:
+                assert resultado == standins.ChainFalsa.resposta(entrada)
+
+
+def test_falha_isolada_propaga_a_excecao(cria_assistente):
+    assistente = cria_assistente(falhar_em={'Serviço parado'})
+    with pytest.raises(standins.ErroLLMFalso):
+        assistente.gerar_texto_chamado('Serviço parado')
+
+
+def test_cache_evita_o_modelo_e_nao_guarda_falhas(cria_assistente):
+    entradas = _entradas(4)
+    assistente = cria_assistente(cache=True, falhar_em={entradas[2]})
+    chain = assistente.chain
+    assert assistente.gerar_texto_chamado(entradas[0]) == standins.ChainFalsa.resposta(entradas[0])
+    assert assistente.gerar_texto_chamado(entradas[0]) == standins.ChainFalsa.resposta(entradas[0])
+    assert chain.chamadas == 1
+    # No lote, só o que não está no cache vai ao modelo; a falha não é guardada e volta a ser tentada
+    resultados = assistente.gerar_textos_chamado(entradas)
+    assert chain.chamadas == 4
+    assert isinstance(resultados[2], standins.ErroLLMFalso)
+    assistente.gerar_textos_chamado(entradas)
+    assert chain.chamadas == 5
+    # usar_cache=False ignora a leitura, mas a nova resposta continua sendo gravada
+    assistente.gerar_texto_chamado(entradas[0], usar_cache=False)
+    assert chain.chamadas == 6
+
+
+def test_stream_entrega_a_resposta_inteira_e_grava_no_cache(cria_assistente):
+    assistente = cria_assistente(cache=True)
+    partes = list(assistente.gerar_texto_chamado_stream('Serviço mirage parado'))
+    assert len(partes) > 1
+    assert ''.join(partes) == standins.ChainFalsa.resposta('Serviço mirage parado')
+    assert list(assistente.gerar_texto_chamado_stream('Serviço mirage parado')) == [''.join(partes)]
+    assert assistente.chain.chamadas == 1
+    assert [metrica['cache'] for metrica in assistente.metricas_stream] == [False, True]
@@ -0,0 +1,100 @@
+# Autor: Yago Assis Mendes Faria
+import asyncio
+import itertools
+
+import pytest
+
+from modules.connection import AsyncConnection
+
+'''
+ Testes de AsyncConnection com o aiomysql substituto (SQLite em threads)
+'''
+
+_tabelas = itertools.count()
+
+
+def _conexao():
+    return AsyncConnection('teste', 'teste', 'robo', 'senha', max_size=4)
+
+
+@pytest.fixture
+def tabela():
+    # Uma tabela nova por teste, criada em um event loop próprio
+    nome = f'lojas_async_{next(_tabelas)}'
+
+    async def cria():
+        async with _conexao() as conexao:
+            assert await conexao.execute_query(f'CREATE TABLE {nome} (id INTEGER PRIMARY KEY, nome TEXT)')
+
+    asyncio.run(cria())
+    return nome
+
+
+def test_connect_le_e_grava_com_commit(tabela):
+    async def cenario():
+        conexao = _conexao()
+        assert await conexao.connect()
+        assert await conexao.execute_query(f'INSERT INTO {tabela} (id, nome) VALUES (%s, %s)', (1, 'Loja 1'))
+        assert await conexao.disconnect()
+        # O commit de execute_query deixa a linha visível para outra conexão
+        async with _conexao() as outra:
+            return await outra.execute_read_query(f'SELECT id, nome FROM {tabela}')
+
+    assert asyncio.run(cenario()) == [(1, 'Loja 1')]
+
+
+def test_disconnect_desfaz_transacao_aberta(tabela):
+    async def cenario():
+        async with _conexao() as conexao:
+            # Escrita sem commit: disconnect devolve a conexão ao pool com rollback
+            await conexao.cursor.execute(f'INSERT INTO {tabela} (id, nome) VALUES (%s, %s)', (2, 'Sem commit'))
+        async with _conexao() as conexao:
+            return await conexao.execute_read_query(f'SELECT id FROM {tabela}')
+
+    assert asyncio.run(cenario()) == []
+
+
+def test_erro_na_consulta_retorna_none_e_false(tabela):
+    async def cenario():
+        async with _conexao() as conexao:
+            return (await conexao.execute_read_query('SELECT * FROM tabela_inexistente'),
+                    await conexao.execute_query('INSERT INTO tabela_inexistente VALUES (1)'))
+
+    assert asyncio.run(cenario()) == (None, False)
+
+
+def test_pool_reaproveitado_no_loop_e_recriado_em_outro_loop(tabela):
+    async def pools_do_loop():
+        async with _conexao() as primeira:
+            pool = primeira.pool
+        async with _conexao() as segunda:
+            assert segunda.pool is pool
+            assert await segunda.execute_read_query(f'SELECT COUNT(*) FROM {tabela}') == [(0,)]
+        # gather: várias conexões simultâneas do mesmo pool
+        resultados = await asyncio.gather(*(_le(tabela) for _ in range(8)))
+        assert resultados == [[(0,)]] * 8
+        return pool, asyncio.get_running_loop()
+
+    pool_1, loop_1 = asyncio.run(pools_do_loop())
+    # O pool do primeiro loop (já fechado) não pode ser reaproveitado: o segundo loop ganha o seu
+    pool_2, _ = asyncio.run(pools_do_loop())
+    assert pool_2 is not pool_1
+    assert loop_1 not in AsyncConnection._pools
+
+
+def test_close_all_pools_fecha_so_os_do_loop_atual(tabela):
+    async def cenario():
+        async with _conexao() as conexao:
+            pool = conexao.pool
+        await AsyncConnection.close_all_pools()
+        assert pool.closed
+        async with _conexao() as conexao:
+            assert conexao.pool is not pool
+            return await conexao.execute_read_query(f'SELECT COUNT(*) FROM {tabela}')
+
+    assert asyncio.run(cenario()) == [(0,)]
+
+
+async def _le(tabela):
+    async with _conexao() as conexao:
+        return await conexao.execute_read_query(f'SELECT COUNT(*) FROM {tabela}')
@@ -0,0 +1,78 @@
+# Autor: Yago Assis Mendes Faria
+import socket
+import threading
+import time
+
+import pytest
+
+from modules.email.enviaEmail import CaixaSaida, SessaoSMTP
+
+'''
+ Testes do encerramento da CaixaSaida (modo não bloqueante do EnviaEmail)
+'''
+
+
+class _SessaoFalsa:
+    def __init__(self, atraso=0.0):
+        self.atraso = atraso
+        self.enviadas = 0
+
+    def enviar(self, msg):
+        time.sleep(self.atraso)
+        self.enviadas += 1
+
+    def fechar(self):
+        pass
+
+
+def test_close_com_timeout_nao_espera_servidor_travado():
+    liberar = threading.Event()
+
+    class SessaoTravada(_SessaoFalsa):
+        def enviar(self, msg):
+            liberar.wait(10)
+
+    caixa = CaixaSaida(SessaoTravada, workers=1)
+    caixa.enfileirar({'To': 'loja@exemplo.com'})
+    inicio = time.monotonic()
+    assert caixa.close(0.2) is False
+    assert time.monotonic() - inicio < 2
+    assert caixa.pendentes == 1
+    liberar.set()
+
+
+def test_enfileirar_concorrente_com_close_nao_deixa_pendentes():
+    for _ in range(20):
+        caixa = CaixaSaida(_SessaoFalsa, workers=2)
+
+        def produz():
+            while True:
+                try:
+                    caixa.enfileirar({'To': 'loja@exemplo.com'})
+                except RuntimeError:
+                    return
+                time.sleep(0.0001)
+
+        produtor = threading.Thread(target=produz)
+        produtor.start()
+        time.sleep(0.005)
+        assert caixa.close(5)
+        produtor.join(5)
+        assert caixa.pendentes == 0
+    with pytest.raises(RuntimeError):
+        caixa.enfileirar({'To': 'loja@exemplo.com'})
+
+
+def test_sessao_smtp_respeita_timeout_do_socket():
+    # Servidor que aceita a conexão TCP e nunca envia a saudação SMTP
+    servidor = socket.socket()
+    servidor.bind(('127.0.0.1', 0))
+    servidor.listen(1)
+    try:
+        sessao = SessaoSMTP('127.0.0.1', servidor.getsockname()[1], 'u', 's', timeout=0.3)
+        inicio = time.monotonic()
+        with pytest.raises(Exception):
+            sessao.enviar({'To': 'loja@exemplo.com'})
+        assert time.monotonic() - inicio < 3
+    finally:
+        servidor.close()
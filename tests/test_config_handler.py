@@ -0,0 +1,78 @@
+# Autor: Yago Assis Mendes Faria
+import json
+import os
+
+import pytest
+
+from modules.config import ConfigHandler
+
+'''
+ Testes de ConfigHandler (alterações pendentes, gravação e get_data)
+'''
+
+
+@pytest.fixture
+def arquivo(tmp_path):
+    caminho = tmp_path / 'config.json'
+    caminho.write_text(json.dumps({'a': 1, 'b': 1, 'email': {'smtp_port': 587}}), encoding='utf-8')
+    return caminho
+
+
+def _le(caminho):
+    return json.loads(caminho.read_text(encoding='utf-8'))
+
+
+def test_load_config_descarta_alteracoes_pendentes(arquivo):
+    handler = ConfigHandler(str(arquivo))
+    handler.set_config_value('a', 2)
+    assert handler.load_config()['a'] == 1
+    handler.set_config_value('b', 3)
+    handler.save_config()
+    assert _le(arquivo) == {'a': 1, 'b': 3, 'email': {'smtp_port': 587}}
+
+
+def test_load_config_cancela_gravacao_adiada(arquivo):
+    handler = ConfigHandler(str(arquivo), debounce=60)
+    handler.set_config_value('a', 2)
+    handler.save_config()
+    assert handler._timer is not None
+    handler.load_config()
+    assert handler._timer is None
+    handler.flush()
+    assert _le(arquivo)['a'] == 1
+
+
+def test_chamado_e_email_usam_o_mesmo_config_handler():
+    from modules.chamado import assistenteChamado
+    from modules.config import ConfigHandler as handler
+    from modules.email import enviaEmail
+    assert assistenteChamado.ConfigHandler is handler
+    assert enviaEmail.ConfigHandler is handler
+
+
+def test_get_data_retorna_o_default_quando_a_conversao_falha(tmp_path):
+    caminho = tmp_path / 'config.json'
+    caminho.write_text(json.dumps({'email': {'smtp_port': 'abc', 'timeout': None, 'tls': '1'}}), encoding='utf-8')
+    handler = ConfigHandler(str(caminho))
+    assert handler.get_data('email.smtp_port', 25) == 25
+    assert handler.get_data('email.smtp_port', tipo=int) is None
+    assert handler.get_data('email.timeout', 30, tipo=int) == 30
+    assert handler.get_data('email.timeout', 30.0) == 30.0
+    assert handler.get_data('email.tls', False) is True
+
+
+@pytest.mark.parametrize('valor', [True, 1.0, '1'])
+def test_set_config_value_grava_valor_igual_de_outro_tipo(arquivo, valor):
+    handler = ConfigHandler(str(arquivo))
+    handler.set_config_value('a', valor)
+    handler.save_config()
+    assert type(_le(arquivo)['a']) is type(valor)
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='permissões POSIX')
+def test_save_config_mantem_as_permissoes_do_arquivo(arquivo):
+    os.chmod(arquivo, 0o644)
+    handler = ConfigHandler(str(arquivo))
+    handler.set_config_value('a', 2)
+    handler.save_config()
+    assert os.stat(arquivo).st_mode & 0o777 == 0o644
@@ -0,0 +1,80 @@
+# Autor: Yago Assis Mendes Faria
+import itertools
+
+import pytest
+
+from modules.connection import Connection, QueryCache
+
+'''
+ Testes da análise de tabelas do QueryCache e da invalidação feita por Connection
+'''
+
+_bancos = itertools.count()
+
+
+@pytest.mark.parametrize('query, tabelas', [
+    ('SELECT l.nome, p.v FROM lojas l, par p WHERE l.id = p.id', {'lojas', 'par'}),
+    ('SELECT * FROM a AS x, `banco`.`B` AS y ORDER BY 1', {'a', 'b'}),
+    ('SELECT * FROM a JOIN b ON a.id = b.id LEFT JOIN c USING (id) WHERE x IN (SELECT y FROM d, e)',
+     {'a', 'b', 'c', 'd', 'e'}),
+    ("SELECT 'from x, y' FROM t", {'t'}),
+    ('SELECT 1', set()),
+])
+def test_tabelas_lidas(query, tabelas):
+    assert QueryCache.tables_read(query) == tabelas
+
+
+@pytest.mark.parametrize('query', [
+    'SELECT * FROM (SELECT 1) x',
+    'SELECT * FROM a, (SELECT * FROM b) x',
+    'SELECT * FROM t USE INDEX (i), u',
+])
+def test_consulta_nao_analisavel_nao_e_guardada(query):
+    assert QueryCache.tables_read(query) is None
+    assert QueryCache().key('h', 'd', query, None) is None
+
+
+@pytest.mark.parametrize('query, tabelas', [
+    ("UPDATE par SET v = 'n'", {'par'}),
+    ('UPDATE a JOIN b ON a.id = b.id SET a.x = b.y', {'a', 'b'}),
+    ('UPDATE a, b SET a.x = b.y WHERE a.id = b.id', {'a', 'b'}),
+    ('DELETE a, b FROM a JOIN b ON a.id = b.id', {'a', 'b'}),
+    ('DELETE FROM a, b USING a JOIN b ON a.id = b.id', {'a', 'b'}),
+    ('INSERT IGNORE INTO banco.t (a) VALUES (1)', {'t'}),
+    ('DROP TABLE IF EXISTS a, b', {'a', 'b'}),
+    ('SET @x = 1', set()),
+    ('CALL atualiza_tudo()', {QueryCache.TODAS}),
+    ("LOAD DATA INFILE 'x.csv' INTO TABLE t", {QueryCache.TODAS}),
+])
+def test_tabelas_escritas(query, tabelas):
+    assert set(QueryCache.tables_written(query)) == tabelas
+
+
+@pytest.fixture
+def conexao():
+    # Cada teste usa um "database" próprio, para as chaves do cache não se misturarem
+    cache = QueryCache()
+    with Connection('teste', f'cache_{next(_bancos)}', 'robo', 'senha', cache=cache) as conexao:
+        for tabela in ('lojas', 'par'):
+            conexao.execute_query(f'DROP TABLE IF EXISTS {tabela}')
+        conexao.execute_query('CREATE TABLE lojas (id INTEGER, nome TEXT)')
+        conexao.execute_query('CREATE TABLE par (id INTEGER, v TEXT)')
+        conexao.execute_query("INSERT INTO lojas VALUES (1, 'L')")
+        conexao.execute_query("INSERT INTO par VALUES (1, 'old')")
+        yield conexao
+
+
+def test_juncao_com_virgula_invalidada_pela_escrita_na_segunda_tabela(conexao):
+    consulta = 'SELECT l.nome, p.v FROM lojas l, par p WHERE l.id = p.id'
+    assert conexao.execute_read_query(consulta) == [('L', 'old')]
+    assert conexao.execute_read_query(consulta) == [('L', 'old')]
+    assert conexao.cache.stats()['hits'] == 1
+    conexao.execute_query("UPDATE par SET v = 'new'")
+    assert conexao.execute_read_query(consulta) == [('L', 'new')]
+
+
+def test_escrita_nao_analisavel_invalida_o_banco(conexao):
+    conexao.execute_read_query('SELECT nome FROM lojas')
+    assert conexao.cache.stats()['entries'] == 1
+    conexao.execute_query('CREATE TRIGGER IF NOT EXISTS tg AFTER INSERT ON lojas BEGIN SELECT 1; END')
+    assert conexao.cache.stats()['entries'] == 0
@@ -0,0 +1,85 @@
+# Autor: Yago Assis Mendes Faria
+import os
+import zipfile
+
+import pytest
+
+from modules.arquivo import RetencaoPastas
+
+'''
+ Testes da compactação de RetencaoPastas com arquivos que somem durante a execução
+'''
+
+
+def _cria(pasta, *nomes):
+    caminhos = []
+    for nome in nomes:
+        caminho = pasta / nome
+        caminho.write_text(f'conteúdo de {nome}', encoding='utf-8')
+        caminhos.append(str(caminho))
+    return caminhos
+
+
+def test_zip_pula_arquivos_que_sumiram_e_remove_os_gravados(tmp_path):
+    caminhos = _cria(tmp_path, 'a.log', 'b.log', 'c.log')
+    os.remove(caminhos[1])
+    destino = tmp_path / '2024-01.zip'
+    RetencaoPastas._compacta_zip(str(destino), caminhos)
+    with zipfile.ZipFile(destino) as arquivo_zip:
+        assert sorted(arquivo_zip.namelist()) == ['a.log', 'c.log']
+    assert not any(os.path.exists(caminho) for caminho in caminhos)
+    # Uma nova execução com os mesmos nomes não duplica o que já foi arquivado
+    RetencaoPastas._compacta_zip(str(destino), _cria(tmp_path, 'd.log'))
+    with zipfile.ZipFile(destino) as arquivo_zip:
+        assert sorted(arquivo_zip.namelist()) == ['a.log', 'c.log', 'd.log']
+
+
+def test_zip_falha_no_meio_nao_altera_o_arquivo_existente(tmp_path, monkeypatch):
+    destino = tmp_path / '2024-01.zip'
+    RetencaoPastas._compacta_zip(str(destino), _cria(tmp_path, 'a.log'))
+    original = destino.read_bytes()
+    caminhos = _cria(tmp_path, 'b.log', 'c.log')
+    escreve = zipfile.ZipFile.write
+
+    def falha_no_segundo(self, arquivo, *args, **kwargs):
+        if arquivo == caminhos[1]:
+            raise OSError('disco cheio')
+        return escreve(self, arquivo, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, 'write', falha_no_segundo)
+    with pytest.raises(OSError):
+        RetencaoPastas._compacta_zip(str(destino), caminhos)
+    assert destino.read_bytes() == original
+    assert all(os.path.exists(caminho) for caminho in caminhos)
+    assert not [nome for nome in os.listdir(tmp_path) if nome.endswith('.tmp')]
+
+
+def test_aplica_ignora_arquivo_removido_durante_a_listagem(tmp_path, monkeypatch):
+    _cria(tmp_path, 'a.log', 'b.log', 'c.log')
+    scandir = os.scandir
+
+    class EntradaRemovida:
+        # Entrada listada cujo arquivo foi apagado antes do stat
+        def __init__(self, entrada):
+            self.name, self.path = entrada.name, entrada.path
+            self.is_file = entrada.is_file
+
+        def stat(self, follow_symlinks=True):
+            raise FileNotFoundError(self.path)
+
+    class Listagem:
+        def __init__(self, pasta):
+            self._entradas = scandir(pasta)
+
+        def __enter__(self):
+            return (EntradaRemovida(e) if e.name == 'b.log' else e for e in self._entradas)
+
+        def __exit__(self, *excecao):
+            self._entradas.close()
+
+    monkeypatch.setattr(os, 'scandir', Listagem)
+    with RetencaoPastas(formato='gzip') as retencao:
+        resumo = retencao.aplica(str(tmp_path), manter_ultimos=0)
+        retencao.aguardar()
+    assert resumo == {'mantidos': 0, 'expirados': 2}
+    assert not retencao.falhas